@@ -0,0 +1,35 @@
+"""
+Autenticación JWT para WebSockets (Channels).
+
+Los navegadores y React Native no permiten cabeceras propias en el handshake
+de WebSocket, así que el access token viaja en la query string
+(``?token=<access>``) y se valida igual que en la API REST
+(rest_framework_simplejwt). Sin token válido ``scope['user']`` es
+AnonymousUser y el consumer decide si cierra la conexión.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+
+@database_sync_to_async
+def get_user_for_token(raw_token):
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Poner en ``scope['user']`` el usuario del token de la query string"""
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        token = (query.get('token') or [None])[0]
+        scope = dict(scope, user=await get_user_for_token(token) if token else AnonymousUser())
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,23 @@
+"""
+Señales del servicio de autenticación: invalidan el perfil cacheado
+(ver apps.place_service.cache.object_cache) cuando cambia el usuario o su
+perfil.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.place_service.cache import PROFILE_CACHE, object_cache
+
+from .models import User, UserProfile
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_profile(sender, instance, **kwargs):
+    object_cache.invalidate_on_commit(PROFILE_CACHE, instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile(sender, instance, **kwargs):
+    object_cache.invalidate_on_commit(PROFILE_CACHE, instance.user_id)
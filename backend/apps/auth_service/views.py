@@ -5,6 +5,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
+from apps.place_service.cache import PROFILE_CACHE, object_cache
 from .models import User, UserProfile
 from .serializers import (
     UserRegistrationSerializer,
@@ -63,6 +64,13 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         profile, created = UserProfile.objects.get_or_create(user=self.request.user)
         return profile
 
+    def retrieve(self, request, *args, **kwargs):
+        # Caché de objetos de dos niveles; se invalida desde signals.py
+        return Response(object_cache.get_or_set(
+            PROFILE_CACHE, request.user.pk, request.build_absolute_uri(),
+            lambda: super(UserProfileView, self).retrieve(request, *args, **kwargs).data,
+        ))
+
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
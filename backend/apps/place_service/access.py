@@ -0,0 +1,146 @@
+"""
+Alcance de los usuarios de negocio (BusinessPlaceAccess).
+
+El alcance de un usuario son los lugares que gestiona más los Google Place IDs
+de sus claims aprobados (las reservas hechas antes de vincular el lugar solo
+tienen google_place_id). Derivarlo exige leer PlaceClaim, resolver los Google
+Place IDs contra Place y, si no resuelven nada, caer en el claimed_by legacy;
+en lugar de repetirlo en cada endpoint se materializa por usuario y se
+regenera desde las señales cuando cambian sus claims o sus lugares.
+
+Cada fila y cada reserva guardan la misma clave de alcance (``scope_key``:
+el lugar o, si no lo hay, el Google Place ID), así las reservas de un
+usuario se filtran con un único ``IN`` indexado.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+
+def resolve_business_scope(user_id, Place, PlaceClaim):
+    """
+    ``(place_ids, google_place_ids)`` de un usuario a partir de sus claims
+    aprobados; si no resuelven ningún Place ni aportan Google Place IDs se
+    usan los lugares con claimed_by (sistema legacy).
+    """
+    claim_place_ids = []
+    google_place_ids = []
+    for place_id, google_place_id in PlaceClaim.objects.filter(
+        claimant_id=user_id, status='approved'
+    ).values_list('place_id', 'google_place_id'):
+        if place_id:
+            claim_place_ids.append(place_id)
+        if google_place_id and google_place_id not in google_place_ids:
+            google_place_ids.append(google_place_id)
+
+    place_ids = list(Place.objects.filter(
+        Q(id__in=claim_place_ids) | Q(google_place_id__in=google_place_ids)
+    ).values_list('id', flat=True))
+    if not place_ids and not google_place_ids:
+        place_ids = list(Place.objects.filter(
+            claimed_by_id=user_id, is_claimed=True
+        ).values_list('id', flat=True))
+    return place_ids, google_place_ids
+
+
+def scope_key(place_id, google_place_id):
+    """Clave de alcance: el lugar si existe, si no el Google Place ID"""
+    return str(place_id) if place_id else google_place_id
+
+
+def access_rows(user_id, place_ids, google_place_ids, BusinessPlaceAccess):
+    return [
+        BusinessPlaceAccess(user_id=user_id, place_id=place_id, scope_key=scope_key(place_id, None))
+        for place_id in place_ids
+    ] + [
+        BusinessPlaceAccess(user_id=user_id, google_place_id=google_place_id, scope_key=google_place_id)
+        for google_place_id in google_place_ids
+    ]
+
+
+def sync_business_access(user_id):
+    """Regenerar las filas de alcance de un usuario"""
+    from django.contrib.auth import get_user_model
+
+    from .models import BusinessPlaceAccess, Place, PlaceClaim
+
+    with transaction.atomic():
+        # Bloquear al usuario serializa las regeneraciones concurrentes (dos
+        # on_commit del mismo usuario insertarían filas duplicadas)
+        if not get_user_model().objects.select_for_update().filter(pk=user_id).exists():
+            BusinessPlaceAccess.objects.filter(user_id=user_id).delete()
+            return
+        place_ids, google_place_ids = resolve_business_scope(user_id, Place, PlaceClaim)
+        BusinessPlaceAccess.objects.filter(user_id=user_id).delete()
+        BusinessPlaceAccess.objects.bulk_create(
+            access_rows(user_id, place_ids, google_place_ids, BusinessPlaceAccess)
+        )
+
+
+def sync_business_access_on_commit(*user_ids):
+    # Al confirmar: en borrados en cascada el usuario o el lugar ya no existen
+    for user_id in {user_id for user_id in user_ids if user_id}:
+        transaction.on_commit(lambda user_id=user_id: sync_business_access(user_id))
+
+
+def business_scope(user_id):
+    """``(place_ids, google_place_ids)`` materializados del usuario (una consulta)"""
+    from .models import BusinessPlaceAccess
+
+    place_ids = []
+    google_place_ids = []
+    for place_id, google_place_id in BusinessPlaceAccess.objects.filter(
+        user_id=user_id
+    ).values_list('place_id', 'google_place_id'):
+        if place_id:
+            place_ids.append(place_id)
+        else:
+            google_place_ids.append(google_place_id)
+    return place_ids, google_place_ids
+
+
+def scope_keys(place_ids, google_place_ids):
+    return [scope_key(place_id, None) for place_id in place_ids] + list(google_place_ids)
+
+
+def scope_q(place_ids, google_place_ids):
+    """
+    Filtro de reservas dentro del alcance: un único ``IN`` sobre
+    Reservation.scope_key (el lugar o, si no tiene, el Google Place ID).
+    """
+    return Q(scope_key__in=scope_keys(place_ids, google_place_ids))
+
+
+def backfill_reservation_scope_keys(Reservation, batch_size=1000):
+    """Rellenar Reservation.scope_key (en Python: el formato del UUID depende del motor)"""
+    pending = []
+    for reservation in Reservation.objects.only('id', 'place_id', 'google_place_id').iterator(chunk_size=batch_size):
+        reservation.scope_key = scope_key(reservation.place_id, reservation.google_place_id) or ''
+        pending.append(reservation)
+        if len(pending) >= batch_size:
+            Reservation.objects.bulk_update(pending, ['scope_key'])
+            pending = []
+    if pending:
+        Reservation.objects.bulk_update(pending, ['scope_key'])
+
+
+def all_access_rows(Place, PlaceClaim, BusinessPlaceAccess):
+    """Filas de alcance de todos los usuarios con claims aprobados o lugares reclamados"""
+    user_ids = set(PlaceClaim.objects.filter(status='approved').values_list('claimant_id', flat=True))
+    user_ids |= set(Place.objects.filter(is_claimed=True, claimed_by__isnull=False).values_list(
+        'claimed_by_id', flat=True
+    ))
+    rows = []
+    for user_id in user_ids:
+        rows.extend(access_rows(user_id, *resolve_business_scope(user_id, Place, PlaceClaim), BusinessPlaceAccess))
+    return rows
+
+
+@transaction.atomic
+def rebuild_business_access(batch_size=1000):
+    """Regenerar el alcance de todos los usuarios"""
+    from .models import BusinessPlaceAccess, Place, PlaceClaim
+
+    BusinessPlaceAccess.objects.all().delete()
+    rows = all_access_rows(Place, PlaceClaim, BusinessPlaceAccess)
+    BusinessPlaceAccess.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
@@ -0,0 +1,63 @@
+"""
+Filtros por características y cocinas sobre la tabla PlaceAttribute.
+
+``features`` y ``cuisines`` se guardan como arreglos JSON en Place; para
+filtrar se usa su copia normalizada (una fila por valor) con índice
+(kind, value, place), así cada filtro es una búsqueda indexada.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+MAX_VALUE_LENGTH = 100
+
+
+def clean_values(values):
+    """Valores de texto únicos y no vacíos de un arreglo JSON"""
+    cleaned = []
+    for value in values or []:
+        if isinstance(value, str) and value.strip():
+            value = value.strip()[:MAX_VALUE_LENGTH]
+            if value not in cleaned:
+                cleaned.append(value)
+    return cleaned
+
+
+def place_attribute_rows(features, cuisines):
+    """Filas de PlaceAttribute (sin el lugar) para los arreglos de un lugar"""
+    from .models import PlaceAttribute
+
+    rows = []
+    for kind, values in ((PlaceAttribute.FEATURE, features), (PlaceAttribute.CUISINE, cuisines)):
+        rows.extend({'kind': kind, 'value': value} for value in clean_values(values))
+    return rows
+
+
+def sync_place_attributes(place):
+    """Reemplazar las filas de PlaceAttribute de un lugar"""
+    from .models import PlaceAttribute
+
+    with transaction.atomic():
+        PlaceAttribute.objects.filter(place_id=place.pk).delete()
+        PlaceAttribute.objects.bulk_create([
+            PlaceAttribute(place_id=place.pk, **row)
+            for row in place_attribute_rows(place.features, place.cuisines)
+        ])
+
+
+def filter_by_attributes(queryset, kind, values, match_all=True):
+    """
+    Restringir ``queryset`` a los lugares con todos (``match_all``) o alguno
+    de los ``values`` del tipo ``kind``.
+    """
+    from .models import PlaceAttribute
+
+    values = clean_values(values)
+    if not values:
+        return queryset
+
+    matching = PlaceAttribute.objects.filter(kind=kind, value__in=values)
+    if match_all and len(values) > 1:
+        matching = matching.values('place').annotate(
+            matched=Count('value')
+        ).filter(matched=len(values))
+    return queryset.filter(id__in=matching.values('place'))
@@ -0,0 +1,313 @@
+"""
+Índice de prefijos en memoria para el autocompletado del buscador.
+
+Mantiene por proceso un arreglo ordenado de claves normalizadas (sin tildes)
+que apuntan a lugares, categorías y ciudades. Una consulta es un bisect sobre
+el prefijo más una selección de los N mejores por puntaje, sin tocar la base
+de datos. Los prefijos de una o dos letras abarcan casi todo el índice, así
+que sus mejores entradas por tipo se guardan y se mantienen al escribir. Se construye perezosamente y se actualiza desde las señales de
+Place y PlaceCategory; cada cambio se publica a los demás procesos
+(``broadcast``) y, si la suscripción se corta, el índice se vuelve a cargar
+en la siguiente consulta.
+"""
+import heapq
+import math
+import threading
+import uuid
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+
+from .cache import broadcast
+from .search import fold_accents
+
+PLACE = 'place'
+CATEGORY = 'category'
+CITY = 'city'
+AUTOCOMPLETE_CHANNEL = 'autocomplete'
+# Prefijos hasta esta longitud se sirven de las listas precalculadas
+SHORT_PREFIX_LENGTH = 2
+# Máximo de sugerencias por tipo (el endpoint limita ?limit= a 20)
+MAX_SUGGESTIONS = 20
+
+
+def _keys_for(label):
+    """Claves de un texto: el texto completo y cada sufijo que empieza en una palabra"""
+    words = fold_accents(label).split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+def _short_prefixes(keys):
+    return {key[:length] for key in keys for length in range(1, SHORT_PREFIX_LENGTH + 1)}
+
+
+class AutocompleteIndex:
+    """Arreglo ordenado de (clave, entrada) con los datos a devolver por entrada"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+        broadcast.subscribe(AUTOCOMPLETE_CHANNEL, self._handle_message, on_reset=self.invalidate)
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'PLACE_AUTOCOMPLETE_ENABLED', True)
+
+    def _reset(self):
+        self._keys = []          # [(clave, (tipo, ref))] ordenado
+        self._entries = {}       # (tipo, ref) -> (puntaje, payload, claves)
+        self._places = {}        # place_id -> (ciudad, category_id) para contar ciudades/categorías
+        self._city_counts = Counter()
+        self._category_counts = Counter()
+        self._categories = {}    # category_id -> payload de la categoría
+        self._top = {}           # (prefijo corto, tipo) -> [entry_id] mejores primero
+        self._bulk = False
+
+    # ------------------------------------------------------------------ carga
+
+    def ensure_loaded(self):
+        broadcast.ensure_started()
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self.rebuild()
+
+    def rebuild(self):
+        from .models import Place, PlaceCategory
+
+        with self._lock:
+            self._reset()
+            for category in PlaceCategory.objects.filter(is_active=True).values('id', 'name', 'icon', 'color'):
+                self._categories[category['id']] = category
+            rows = Place.objects.filter(is_active=True).values_list(
+                'id', 'name', 'city', 'category_id', 'average_rating', 'total_reviews'
+            )
+            # Carga masiva: se agregan las claves sin ordenar y se ordena una vez
+            self._bulk = True
+            for place_id, name, city, category_id, rating, reviews in rows.iterator():
+                self._add_place(place_id, name, city, category_id, rating, reviews)
+            self._keys.sort()
+            self._bulk = False
+            for city in list(self._city_counts):
+                self._refresh_city(city)
+            for category_id in list(self._category_counts):
+                self._refresh_category(category_id)
+            self._loaded = True
+
+    def invalidate(self):
+        """Descartar el índice; se vuelve a cargar en la siguiente consulta"""
+        with self._lock:
+            self._loaded = False
+            self._reset()
+
+    # ------------------------------------------------------------ entradas
+
+    def _put(self, entry_id, label, score, payload):
+        self._remove(entry_id)
+        keys = _keys_for(label)
+        for key in keys:
+            if self._bulk:
+                self._keys.append((key, entry_id))
+            else:
+                insort(self._keys, (key, entry_id))
+        self._entries[entry_id] = (score, payload, keys)
+        for prefix in _short_prefixes(keys):
+            top = self._top.get((prefix, entry_id[0]))
+            if top is None:
+                continue
+            # La lista tiene a los mejores: basta insertar y recortar
+            position = next(
+                (i for i, other in enumerate(top) if self._entries[other][0] < score), len(top)
+            )
+            top.insert(position, entry_id)
+            del top[MAX_SUGGESTIONS:]
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in entry[2]:
+            position = bisect_left(self._keys, (key, entry_id))
+            if position < len(self._keys) and self._keys[position] == (key, entry_id):
+                del self._keys[position]
+        for prefix in _short_prefixes(entry[2]):
+            top_key = (prefix, entry_id[0])
+            if entry_id in self._top.get(top_key, ()):
+                # El siguiente mejor no está guardado: se recalcula al consultar
+                del self._top[top_key]
+
+    def _refresh_city(self, city):
+        if not city:
+            return
+        if self._city_counts[city] > 0:
+            self._put((CITY, city), city, self._city_counts[city], {'name': city})
+        else:
+            del self._city_counts[city]
+            self._remove((CITY, city))
+
+    def _refresh_category(self, category_id):
+        category = self._categories.get(category_id)
+        if category is None or self._category_counts[category_id] <= 0:
+            self._remove((CATEGORY, category_id))
+            return
+        self._put((CATEGORY, category_id), category['name'], self._category_counts[category_id], dict(category))
+
+    def _add_place(self, place_id, name, city, category_id, rating, reviews):
+        rating = float(rating or 0)
+        reviews = reviews or 0
+        # Calificación ponderada por volumen: 4.5 con 300 reseñas > 5.0 con 1
+        score = rating * math.log1p(reviews)
+        self._put((PLACE, place_id), name, (score, rating, reviews), {
+            'id': str(place_id),
+            'name': name,
+            'city': city,
+            'average_rating': round(rating, 2),
+            'total_reviews': reviews,
+        })
+        self._places[place_id] = (city, category_id)
+        self._city_counts[city] += 1
+        self._category_counts[category_id] += 1
+        if not self._bulk:
+            self._refresh_city(city)
+            self._refresh_category(category_id)
+
+    def _drop_place(self, place_id):
+        previous = self._places.pop(place_id, None)
+        self._remove((PLACE, place_id))
+        if previous is None:
+            return
+        city, category_id = previous
+        self._city_counts[city] -= 1
+        self._category_counts[category_id] -= 1
+        self._refresh_city(city)
+        self._refresh_category(category_id)
+
+    # ----------------------------------------------------- actualizaciones
+
+    def _update_place(self, place_id, name, city, category_id, rating, reviews, is_active):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop_place(place_id)
+            if is_active:
+                self._add_place(place_id, name, city, category_id, rating, reviews)
+
+    def _remove_place(self, place_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop_place(place_id)
+
+    def _update_category(self, category, is_active):
+        if not self._loaded:
+            return
+        with self._lock:
+            if is_active:
+                self._categories[category['id']] = category
+            else:
+                self._categories.pop(category['id'], None)
+            self._refresh_category(category['id'])
+
+    def _remove_category(self, category_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._categories.pop(category_id, None)
+            self._refresh_category(category_id)
+
+    def _publish(self, data):
+        if self.enabled:
+            broadcast.publish(AUTOCOMPLETE_CHANNEL, data)
+
+    def update_place(self, place):
+        row = [
+            place.name, place.city, place.category_id,
+            float(place.average_rating or 0), place.total_reviews, place.is_active,
+        ]
+        self._update_place(place.pk, *row)
+        self._publish({'place': [str(place.pk)] + row})
+
+    def remove_place(self, place_id):
+        self._remove_place(place_id)
+        self._publish({'remove_place': str(place_id)})
+
+    def update_category(self, category):
+        payload = {'id': category.pk, 'name': category.name, 'icon': category.icon, 'color': category.color}
+        self._update_category(payload, category.is_active)
+        self._publish({'category': payload, 'is_active': category.is_active})
+
+    def remove_category(self, category_id):
+        self._remove_category(category_id)
+        self._publish({'remove_category': category_id})
+
+    def _handle_message(self, data):
+        if 'place' in data:
+            place_id, *fields = data['place']
+            self._update_place(uuid.UUID(place_id), *fields)
+        elif 'remove_place' in data:
+            self._remove_place(uuid.UUID(data['remove_place']))
+        elif 'category' in data:
+            self._update_category(data['category'], data['is_active'])
+        elif 'remove_category' in data:
+            self._remove_category(data['remove_category'])
+
+    # ------------------------------------------------------------- consulta
+
+    def suggest(self, prefix, limit=8):
+        """Mejores lugares, categorías y ciudades cuyo texto empieza por ``prefix``"""
+        self.ensure_loaded()
+        prefix = ' '.join(fold_accents(prefix).split())
+        results = {PLACE: [], CATEGORY: [], CITY: []}
+        if not prefix:
+            return results
+
+        with self._lock:
+            if len(prefix) <= SHORT_PREFIX_LENGTH and limit <= MAX_SUGGESTIONS:
+                for kind in results:
+                    top = self._top.get((prefix, kind))
+                    if top is None:
+                        top = self._top[(prefix, kind)] = self._best(prefix, kind, MAX_SUGGESTIONS)
+                    results[kind] = [self._entries[entry_id][1] for entry_id in top[:limit]]
+                return results
+            for kind in results:
+                results[kind] = [self._entries[entry_id][1] for entry_id in self._best(prefix, kind, limit)]
+        return results
+
+    def _best(self, prefix, kind, limit):
+        """Las ``limit`` entradas de ``kind`` con mejor puntaje para el prefijo"""
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + '\uffff',), lo=start)
+        matched = {entry_id for _, entry_id in self._keys[start:end] if entry_id[0] == kind}
+        return heapq.nlargest(limit, matched, key=lambda entry_id: self._entries[entry_id][0])
+
+
+def suggest_from_database(prefix, limit=8):
+    """Alternativa sin índice (PLACE_AUTOCOMPLETE_ENABLED=False): prefijo con istartswith"""
+    from django.db.models import Count
+
+    from .models import Place, PlaceCategory
+
+    places = Place.objects.filter(is_active=True, name__istartswith=prefix).order_by(
+        '-average_rating', '-total_reviews'
+    ).values('id', 'name', 'city', 'average_rating', 'total_reviews')[:limit]
+    categories = PlaceCategory.objects.filter(is_active=True, name__istartswith=prefix).annotate(
+        places_count=Count('places')
+    ).order_by('-places_count').values('id', 'name', 'icon', 'color')[:limit]
+    cities = Place.objects.filter(is_active=True, city__istartswith=prefix).values('city').annotate(
+        places_count=Count('id')
+    ).order_by('-places_count')[:limit]
+
+    return {
+        PLACE: [
+            {**place, 'id': str(place['id']), 'average_rating': round(float(place['average_rating'] or 0), 2)}
+            for place in places
+        ],
+        CATEGORY: list(categories),
+        CITY: [{'name': row['city']} for row in cities],
+    }
+
+
+autocomplete_index = AutocompleteIndex()
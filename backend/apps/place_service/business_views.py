@@ -5,65 +5,56 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from django.db.models import Q, Count, Avg
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from django.utils import timezone
 
 from .models import Place, Reservation, Review, PlaceClaim, BusinessProfile
 from .serializers import (
     PlaceDetailSerializer as PlaceSerializer, ReservationSerializer, ReviewSerializer,
     PlaceClaimSerializer, PlaceClaimCreateSerializer, BusinessProfileSerializer,
-    BusinessReservationSerializer
+    BusinessReservationSerializer, BusinessPlaceSummarySerializer
 )
+from .access import business_scope, scope_q
+from .cache import DASHBOARD_CACHE_PREFIX, business_tags, get_result, result_key, set_result
+from .pagination import ReservationCursorPagination
+from .timeseries import METRICS, build_timeseries, validate_range
+from .transitions import MAX_BULK_RESERVATIONS, RESERVATION_TRANSITIONS, bulk_transition
 
 
 class BusinessViewSet(viewsets.ViewSet):
     """ViewSet para la gestión de negocios"""
     permission_classes = [IsAuthenticated]
+    # Snapshot del dashboard (segundos); las escrituras lo invalidan antes
+    DASHBOARD_CACHE_TIMEOUT = 300
 
     def _check_business_role(self, user):
         """Verificar que el usuario sea de tipo BUSINESS"""
         if user.role != 'BUSINESS':
             raise PermissionDenied('Acceso denegado. Solo usuarios de negocio pueden usar este endpoint.')
 
+    def _business_scope(self, user):
+        """
+        IDs de los lugares del negocio y google_place_ids de sus claims
+        aprobados, leídos de BusinessPlaceAccess (ver access.py). Se guarda en
+        la vista, que vive lo que dura la petición.
+        """
+        if getattr(self, '_scope_user_id', None) != user.pk:
+            self._scope = business_scope(user.pk)
+            self._scope_user_id = user.pk
+        return self._scope
+
+    def _business_reservations(self, user):
+        """Reservas dentro del alcance del negocio"""
+        return Reservation.objects.filter(scope_q(*self._business_scope(user)))
+
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """Dashboard principal del negocio con estadísticas"""
         user = request.user
         self._check_business_role(user)
         
-        # Obtener lugares reclamados por el usuario a través de PlaceClaim
-        approved_claims = PlaceClaim.objects.filter(
-            claimant=user, 
-            status='approved'
-        )
-        
-        # Obtener IDs de lugares tanto locales como de Google Places
-        place_ids = []
-        google_place_ids = []
-        
-        for claim in approved_claims:
-            if claim.place:
-                place_ids.append(claim.place.id)
-            if claim.google_place_id:
-                google_place_ids.append(claim.google_place_id)
-        
-        # Filtrar lugares por IDs locales O por google_place_id
-        user_places = Place.objects.filter(
-            Q(id__in=place_ids) | 
-            Q(google_place_id__in=google_place_ids)
-        )
-        
-        # Si no hay claims aprobados, también buscar lugares con claimed_by (sistema legacy)
-        if not user_places.exists() and not google_place_ids:
-            legacy_places = Place.objects.filter(claimed_by=user, is_claimed=True)
-            user_places = legacy_places
-        
-        # Para Google Places sin Place asociado, verificar que al menos hay claims con google_place_id
-        if not user_places.exists() and google_place_ids:
-            print(f"📍 Usuario tiene claims para Google Places: {google_place_ids}")
-            # No hay Places en BD, pero sí hay claims para Google Places
-            # Continuar con las estadísticas usando google_place_ids
-        elif not user_places.exists() and not google_place_ids:
+        place_ids, google_place_ids = self._business_scope(user)
+        if not place_ids and not google_place_ids:
             return Response({
                 'message': 'No tienes lugares reclamados',
                 'has_places': False,
@@ -73,45 +64,52 @@ class BusinessViewSet(viewsets.ViewSet):
                 ).count()
             })
 
-        # Estadísticas generales
-        # Filtrar reservas tanto por place como por google_place_id
-        total_reservations = Reservation.objects.filter(
-            Q(place__in=user_places) | 
-            Q(google_place_id__in=google_place_ids)
+        # El panel se consulta periódicamente: se cachea por usuario y se
+        # invalida con las escrituras de reservas y reseñas de sus lugares
+        cache_key = result_key(
+            DASHBOARD_CACHE_PREFIX,
+            {'user': user.pk, 'places': sorted(map(str, place_ids)), 'google': sorted(google_place_ids)},
+            business_tags(place_ids, google_place_ids),
         )
-        pending_reservations = total_reservations.filter(status='PENDING').count()
-        confirmed_reservations = total_reservations.filter(status='CONFIRMED').count()
-        total_reviews = Review.objects.filter(place__in=user_places).count()
-        avg_rating = Review.objects.filter(place__in=user_places).aggregate(
-            avg=Avg('rating')
-        )['avg'] or 0
+        snapshot = get_result(cache_key) if cache_key else None
+        if snapshot is None:
+            snapshot = self._dashboard_snapshot(place_ids, google_place_ids)
+            if cache_key:
+                set_result(cache_key, snapshot, self.DASHBOARD_CACHE_TIMEOUT)
+        return Response(snapshot)
 
-        # Reservas de los últimos 7 días
+    def _dashboard_snapshot(self, place_ids, google_place_ids):
+        # Una consulta con agregación condicional por tabla
         week_ago = timezone.now() - timedelta(days=7)
-        recent_reservations = total_reservations.filter(
-            created_at__gte=week_ago
-        ).count()
-
-        # Reseñas recientes sin respuesta
-        unresponded_reviews = Review.objects.filter(
-            place__in=user_places,
-            business_response__isnull=True
-        ).count()
+        reservation_stats = Reservation.objects.filter(
+            scope_q(place_ids, google_place_ids)
+        ).aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='PENDING')),
+            confirmed=Count('id', filter=Q(status='CONFIRMED')),
+            recent=Count('id', filter=Q(created_at__gte=week_ago)),
+        )
+        review_stats = Review.objects.filter(place_id__in=place_ids).aggregate(
+            total=Count('id'),
+            average=Avg('rating'),
+            unresponded=Count('id', filter=Q(business_response__isnull=True)),
+        )
+        places = Place.objects.filter(id__in=place_ids).select_related('category')
 
-        return Response({
+        return {
             'has_places': True,
             'stats': {
-                'total_places': user_places.count(),
-                'total_reservations': total_reservations.count(),
-                'pending_reservations': pending_reservations,
-                'confirmed_reservations': confirmed_reservations,
-                'total_reviews': total_reviews,
-                'average_rating': round(avg_rating, 1),
-                'recent_reservations': recent_reservations,
-                'unresponded_reviews': unresponded_reviews,
+                'total_places': len(place_ids),
+                'total_reservations': reservation_stats['total'],
+                'pending_reservations': reservation_stats['pending'],
+                'confirmed_reservations': reservation_stats['confirmed'],
+                'total_reviews': review_stats['total'],
+                'average_rating': round(review_stats['average'] or 0, 1),
+                'recent_reservations': reservation_stats['recent'],
+                'unresponded_reviews': review_stats['unresponded'],
             },
-            'places': PlaceSerializer(user_places, many=True).data
-        })
+            'places': BusinessPlaceSummarySerializer(places, many=True).data
+        }
 
     @action(detail=False, methods=['get'])
     def reservations(self, request):
@@ -119,41 +117,11 @@ class BusinessViewSet(viewsets.ViewSet):
         user = request.user
         self._check_business_role(user)
         
-        # Obtener lugares reclamados por el usuario a través de PlaceClaim
-        approved_claims = PlaceClaim.objects.filter(
-            claimant=user, 
-            status='approved'
-        )
-        
-        # Obtener IDs de lugares tanto locales como de Google Places
-        place_ids = []
-        google_place_ids = []
-        
-        for claim in approved_claims:
-            if claim.place:
-                place_ids.append(claim.place.id)
-            if claim.google_place_id:
-                google_place_ids.append(claim.google_place_id)
-        
-        # Filtrar lugares por IDs locales O por google_place_id
-        user_places = Place.objects.filter(
-            Q(id__in=place_ids) | 
-            Q(google_place_id__in=google_place_ids)
-        )
-        
-        # Si no hay claims aprobados, también buscar lugares con claimed_by (sistema legacy)
-        if not user_places.exists():
-            legacy_places = Place.objects.filter(claimed_by=user, is_claimed=True)
-            user_places = legacy_places
-        
         status_filter = request.query_params.get('status', None)
         date_filter = request.query_params.get('date', None)
         
-        # Filtrar reservas tanto por place como por google_place_id
-        reservations = Reservation.objects.filter(
-            Q(place__in=user_places) | 
-            Q(google_place_id__in=google_place_ids)
-        )
+        # Se traen en la misma consulta todas las relaciones que usa el serializer
+        reservations = self._business_reservations(user).select_related('place', 'user', 'approved_by')
         
         if status_filter:
             # Convertir a uppercase para coincidir con las opciones del modelo
@@ -167,10 +135,20 @@ class BusinessViewSet(viewsets.ViewSet):
             except ValueError:
                 pass
         
-        reservations = reservations.order_by('-created_at')
-        
-        serializer = BusinessReservationSerializer(reservations, many=True)
-        return Response(serializer.data)
+        # Ventana de fechas (?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD), inclusiva
+        for param, lookup in (('date_from', 'reservation_date__gte'), ('date_to', 'reservation_date__lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    reservations = reservations.filter(**{lookup: datetime.strptime(value, '%Y-%m-%d').date()})
+                except ValueError:
+                    pass
+        
+        # Paginación por cursor ordenada por -created_at
+        paginator = ReservationCursorPagination()
+        page = paginator.paginate_queryset(reservations, request, view=self)
+        serializer = BusinessReservationSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['post'])
     def approve_reservation(self, request):
@@ -179,19 +157,10 @@ class BusinessViewSet(viewsets.ViewSet):
         business_notes = request.data.get('notes', '')
         
         try:
-            # Obtener places reclamados y sus google_place_ids
-            place_claims = PlaceClaim.objects.filter(
-                claimant=request.user,
-                status='approved'
-            )
-            user_places = Place.objects.filter(id__in=place_claims.values_list('place_id', flat=True))
-            google_place_ids = place_claims.values_list('google_place_id', flat=True)
-            
-            # Buscar la reserva tanto en places regulares como en Google Places
-            reservation = Reservation.objects.get(
-                Q(id=reservation_id) &
-                (Q(place__in=user_places) | Q(google_place_id__in=google_place_ids)) &
-                Q(status='PENDING')  # Usando mayúsculas para ser consistente
+            # Buscar la reserva dentro del alcance del negocio
+            reservation = self._business_reservations(request.user).get(
+                id=reservation_id,
+                status='PENDING'  # Usando mayúsculas para ser consistente
             )
             
             reservation.status = 'CONFIRMED'
@@ -220,19 +189,10 @@ class BusinessViewSet(viewsets.ViewSet):
         rejection_reason = request.data.get('reason', '')
         
         try:
-            # Obtener places reclamados y sus google_place_ids
-            place_claims = PlaceClaim.objects.filter(
-                claimant=request.user,
-                status='approved'
-            )
-            user_places = Place.objects.filter(id__in=place_claims.values_list('place_id', flat=True))
-            google_place_ids = place_claims.values_list('google_place_id', flat=True)
-            
-            # Buscar la reserva tanto en places regulares como en Google Places
-            reservation = Reservation.objects.get(
-                Q(id=reservation_id) &
-                (Q(place__in=user_places) | Q(google_place_id__in=google_place_ids)) &
-                Q(status='PENDING')  # Usando mayúsculas para ser consistente
+            # Buscar la reserva dentro del alcance del negocio
+            reservation = self._business_reservations(request.user).get(
+                id=reservation_id,
+                status='PENDING'  # Usando mayúsculas para ser consistente
             )
             
             reservation.status = 'REJECTED'
@@ -259,19 +219,10 @@ class BusinessViewSet(viewsets.ViewSet):
         business_notes = request.data.get('notes', '')
         
         try:
-            # Obtener places reclamados y sus google_place_ids
-            place_claims = PlaceClaim.objects.filter(
-                claimant=request.user,
-                status='approved'
-            )
-            user_places = Place.objects.filter(id__in=place_claims.values_list('place_id', flat=True))
-            google_place_ids = place_claims.values_list('google_place_id', flat=True)
-            
-            # Buscar la reserva tanto en places regulares como en Google Places
-            reservation = Reservation.objects.get(
-                Q(id=reservation_id) &
-                (Q(place__in=user_places) | Q(google_place_id__in=google_place_ids)) &
-                Q(status='CONFIRMED')  # Solo se pueden completar reservas confirmadas
+            # Buscar la reserva dentro del alcance del negocio
+            reservation = self._business_reservations(request.user).get(
+                id=reservation_id,
+                status='CONFIRMED'  # Solo se pueden completar reservas confirmadas
             )
             
             reservation.status = 'COMPLETED'
@@ -299,19 +250,10 @@ class BusinessViewSet(viewsets.ViewSet):
         business_notes = request.data.get('notes', '')
         
         try:
-            # Obtener places reclamados y sus google_place_ids
-            place_claims = PlaceClaim.objects.filter(
-                claimant=request.user,
-                status='approved'
-            )
-            user_places = Place.objects.filter(id__in=place_claims.values_list('place_id', flat=True))
-            google_place_ids = place_claims.values_list('google_place_id', flat=True)
-            
-            # Buscar la reserva tanto en places regulares como en Google Places
-            reservation = Reservation.objects.get(
-                Q(id=reservation_id) &
-                (Q(place__in=user_places) | Q(google_place_id__in=google_place_ids)) &
-                Q(status='CONFIRMED')  # Solo se pueden marcar como no-show las confirmadas
+            # Buscar la reserva dentro del alcance del negocio
+            reservation = self._business_reservations(request.user).get(
+                id=reservation_id,
+                status='CONFIRMED'  # Solo se pueden marcar como no-show las confirmadas
             )
             
             reservation.status = 'NO_SHOW'
@@ -332,15 +274,59 @@ class BusinessViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=False, methods=['post'])
+    def bulk_reservations(self, request):
+        """
+        Aprobar, rechazar, completar o marcar como no presentadas varias
+        reservas en una transacción: {"action": "approve|reject|complete|no_show",
+        "reservation_ids": [...], "notes": "", "reason": ""}. Devuelve el
+        resultado de cada id.
+        """
+        user = request.user
+        self._check_business_role(user)
+        
+        transition = request.data.get('action')
+        reservation_ids = request.data.get('reservation_ids')
+        
+        if transition not in RESERVATION_TRANSITIONS:
+            return Response(
+                {'error': f"action debe ser uno de: {', '.join(RESERVATION_TRANSITIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(reservation_ids, list) or not reservation_ids:
+            return Response(
+                {'error': 'reservation_ids debe ser una lista no vacía'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(reservation_ids) > MAX_BULK_RESERVATIONS:
+            return Response(
+                {'error': f'Máximo {MAX_BULK_RESERVATIONS} reservas por solicitud'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results, updated = bulk_transition(
+            self._business_reservations(user), reservation_ids, transition, user,
+            notes=request.data.get('notes', ''), reason=request.data.get('reason', '')
+        )
+        
+        return Response({
+            'message': f'{updated} reservas actualizadas',
+            'action': transition,
+            'updated': updated,
+            'results': results
+        })
+
     @action(detail=False, methods=['get'])
     def reviews(self, request):
-        """Obtener reseñas de los lugares del negocio"""
-        user = request.user
-        user_places = Place.objects.filter(claimed_by=user, is_claimed=True)
+        """
+        Obtener reseñas de los lugares del negocio (todo su alcance en
+        BusinessPlaceAccess; responderlas requiere claimed_by)
+        """
+        place_ids, _ = self._business_scope(request.user)
         
         unresponded_only = request.query_params.get('unresponded', 'false').lower() == 'true'
         
-        reviews = Review.objects.filter(place__in=user_places)
+        reviews = Review.objects.filter(place_id__in=place_ids)
         
         if unresponded_only:
             reviews = reviews.filter(business_response__isnull=True)
@@ -363,9 +349,12 @@ class BusinessViewSet(viewsets.ViewSet):
             )
         
         try:
+            # Escribir requiere ser el dueño reclamado del lugar (claimed_by);
+            # el alcance de BusinessPlaceAccess solo da acceso de lectura
             review = Review.objects.get(
                 id=review_id,
-                place__claimed_by=request.user
+                place__claimed_by=request.user,
+                place__is_claimed=True
             )
             
             review.business_response = response_text
@@ -486,54 +475,72 @@ class BusinessViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def analytics(self, request):
-        """Obtener analytics del negocio"""
+        """
+        Analytics del negocio: series por intervalo (?granularity=day|week|month)
+        entre ?start= y ?end= (YYYY-MM-DD) o para los últimos ?days= días,
+        con ?metrics= de reservations, no_shows, cancellations, reviews y
+        ratings. El número de consultas es constante (ver timeseries.py).
+        """
         user = request.user
-        user_places = Place.objects.filter(claimed_by=user, is_claimed=True)
+        place_ids, google_place_ids = self._business_scope(user)
         
         # Período de análisis (último mes por defecto)
-        days = int(request.query_params.get('days', 30))
-        start_date = timezone.now() - timedelta(days=days)
-        
-        # Reservas por día
-        reservations_by_day = []
-        for i in range(days):
-            day = start_date + timedelta(days=i)
-            count = Reservation.objects.filter(
-                place__in=user_places,
-                date=day.date()
-            ).count()
-            reservations_by_day.append({
-                'date': day.strftime('%Y-%m-%d'),
-                'count': count
-            })
-        
-        # Reseñas por rating
-        reviews_by_rating = []
-        for rating in range(1, 6):
-            count = Review.objects.filter(
-                place__in=user_places,
-                rating=rating
-            ).count()
-            reviews_by_rating.append({
-                'rating': rating,
-                'count': count
-            })
-        
-        # Top lugares por reservas
-        top_places = user_places.annotate(
-            reservation_count=Count('reservation')
+        granularity = request.query_params.get('granularity', 'day')
+        try:
+            days = request.query_params.get('days', '30')
+            if not days.isdigit() or int(days) < 1:
+                raise ValueError('days must be a positive integer')
+            days = int(days)
+            end = date.fromisoformat(request.query_params['end']) if 'end' in request.query_params \
+                else timezone.localdate()
+            start = date.fromisoformat(request.query_params['start']) if 'start' in request.query_params \
+                else end - timedelta(days=days - 1)
+            metrics = request.query_params.get('metrics')
+            metrics = [m.strip() for m in metrics.split(',') if m.strip()] if metrics else list(METRICS)
+            unknown = [m for m in metrics if m not in METRICS]
+            if unknown:
+                raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+            validate_range(start, end, granularity)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        timeseries = build_timeseries(start, end, granularity, metrics, place_ids, google_place_ids)
+        
+        # Reseñas por rating (una consulta agrupada)
+        rating_counts = dict(Review.objects.filter(place_id__in=place_ids).order_by().values_list(
+            'rating'
+        ).annotate(count=Count('id')))
+        reviews_by_rating = [
+            {'rating': rating, 'count': rating_counts.get(rating, 0)} for rating in range(1, 6)
+        ]
+        
+        # Top lugares por reservas en el período
+        top_places = Place.objects.filter(id__in=place_ids).annotate(
+            reservation_count=Count(
+                'reservations', filter=Q(reservations__reservation_date__range=(start, end))
+            )
         ).order_by('-reservation_count')[:5]
         
-        return Response({
-            'period_days': days,
-            'reservations_by_day': reservations_by_day,
+        response = {
+            'period_days': (end - start).days + 1,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'granularity': granularity,
+            **timeseries,
             'reviews_by_rating': reviews_by_rating,
             'top_places': [{
                 'name': place.name,
                 'reservation_count': place.reservation_count,
                 'average_rating': place.average_rating or 0
             } for place in top_places]
-        })
+        }
+        if 'reservations' in timeseries['series']:
+            # Formato anterior (un punto por intervalo)
+            response['reservations_by_day'] = [
+                {'date': bucket, 'count': count}
+                for bucket, count in zip(timeseries['buckets'], timeseries['series']['reservations'])
+            ]
+        return Response(response)
 
 
 class PlaceClaimViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,394 @@
+"""
+Caché de resultados con invalidación por etiquetas.
+
+Cada etiqueta (p. ej. ``places``) tiene un número de versión guardado en la
+caché; las claves de resultados incluyen las versiones de sus etiquetas, así
+que invalidar es incrementar la versión (las entradas viejas simplemente
+dejan de leerse y expiran solas). Usa la caché ``default`` de Django (Redis
+cuando REDIS_URL está configurado).
+
+``object_cache`` añade un nivel local (LRU por proceso) delante de la caché
+``default`` para objetos que se leen mucho y cambian poco.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PLACES_TAG = 'places'
+# Escrituras de puntajes (rank_score, average_rating...): solo la usan los
+# listados ordenados por esos campos
+RANKING_TAG = 'places-ranking'
+DASHBOARD_CACHE_PREFIX = 'business-dashboard'
+
+# Las versiones viven más que los resultados para no reutilizar una versión
+# expirada con resultados viejos todavía en caché
+TAG_VERSION_TIMEOUT = None
+
+
+def business_tags(place_ids=(), google_place_ids=()):
+    """Etiquetas de los datos de negocio (reservas, reseñas) de cada lugar"""
+    return (
+        [f'business-place:{place_id}' for place_id in place_ids]
+        + [f'business-google:{google_place_id}' for google_place_id in google_place_ids]
+    )
+
+
+def _tag_key(tag):
+    return f'tag-version:{tag}'
+
+
+def _initial_version():
+    # Basada en el reloj: si Redis descarta la versión (allkeys-lru), la nueva
+    # no coincide con la de resultados viejos que sigan en caché
+    return time.time_ns() // 1000
+
+
+def tag_versions(tags):
+    """Versión actual de cada etiqueta (se inicializa la primera vez)"""
+    keys = {_tag_key(tag): tag for tag in tags}
+    versions = cache.get_many(list(keys))
+    missing = {key: _initial_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=TAG_VERSION_TIMEOUT)
+        versions.update(missing)
+    return [versions[_tag_key(tag)] for tag in tags]
+
+
+def invalidate_tags(*tags):
+    """Invalidar todas las entradas asociadas a ``tags``"""
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            # La versión no existe todavía: cualquier valor nuevo sirve
+            cache.set(_tag_key(tag), _initial_version(), timeout=TAG_VERSION_TIMEOUT)
+        except Exception:
+            logger.warning("No se pudo invalidar la etiqueta de caché %s", tag, exc_info=True)
+
+
+def invalidate_tags_on_commit(*tags):
+    """Invalidar al confirmar la transacción, para no cachear datos a medio escribir"""
+    transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+def result_key(prefix, params, tags):
+    """
+    Clave de caché para ``params`` normalizados más las versiones de ``tags``;
+    None si la caché no está disponible.
+    """
+    normalized = json.dumps(sorted(params.items()), separators=(',', ':'), default=str)
+    try:
+        versions = '.'.join(str(version) for version in tag_versions(tags))
+    except Exception:
+        logger.warning("No se pudieron leer las versiones de caché", exc_info=True)
+        return None
+    digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    return f'{prefix}:{versions}:{digest}'
+
+
+def get_result(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        # Una caché caída no debe tumbar el endpoint
+        logger.warning("No se pudo leer la caché de resultados", exc_info=True)
+        return None
+
+
+def set_result(key, value, timeout):
+    try:
+        cache.set(key, value, timeout=timeout)
+    except Exception:
+        logger.warning("No se pudo escribir la caché de resultados", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Mensajes entre procesos
+# ---------------------------------------------------------------------------
+
+BROADCAST_CHANNEL_PREFIX = 'spotlyvf:'
+
+
+class ProcessBroadcast:
+    """
+    Mensajes entre los procesos del servidor por Redis pub/sub (REDIS_URL),
+    para que las estructuras en memoria de cada worker (LRU de objetos,
+    índices) vean las escrituras hechas en otro.
+
+    Cada proceso crea de forma perezosa un cliente publicador y un hilo
+    suscriptor, y los vuelve a crear tras un fork. Los mensajes propios se
+    ignoran: quien publica ya aplicó el cambio. ``on_reset`` de cada canal
+    se llama al arrancar el hilo y cuando la suscripción se corta, porque en
+    esos momentos se pueden haber perdido mensajes. Sin Redis no hace nada.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._handlers = {}
+        self._pid = None
+        self._origin = None
+        self._publisher = None
+
+    @property
+    def available(self):
+        return bool(getattr(settings, 'REDIS_URL', ''))
+
+    @property
+    def running(self):
+        return self._pid == os.getpid()
+
+    def subscribe(self, channel, handler, on_reset=None):
+        """Registrar ``handler(data)`` para los mensajes de ``channel``"""
+        self._handlers[BROADCAST_CHANNEL_PREFIX + channel] = (handler, on_reset)
+
+    def _client(self):
+        import redis
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    def ensure_started(self):
+        """Cliente y suscriptor de este proceso (una vez por proceso)"""
+        if self.running or not self.available:
+            return
+        with self._lock:
+            if self.running:
+                return
+            self._pid = os.getpid()
+            self._origin = f'{self._pid}:{uuid.uuid4().hex}'
+            self._publisher = self._client()
+            # Lo cargado antes del fork no recibió mensajes
+            self._reset()
+            threading.Thread(target=self._listen, name='process-broadcast', daemon=True).start()
+
+    def publish(self, channel, data):
+        self.ensure_started()
+        if not self.running:
+            return
+        try:
+            self._publisher.publish(
+                BROADCAST_CHANNEL_PREFIX + channel,
+                json.dumps({'origin': self._origin, 'data': data}, default=str),
+            )
+        except Exception:
+            logger.warning("No se pudo publicar el mensaje en %s", channel, exc_info=True)
+
+    def _reset(self):
+        for _, on_reset in self._handlers.values():
+            if on_reset is not None:
+                on_reset()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client().pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(BROADCAST_CHANNEL_PREFIX + '*')
+                for message in pubsub.listen():
+                    self._dispatch(message)
+            except Exception:
+                logger.warning("Suscripción entre procesos interrumpida", exc_info=True)
+                self._reset()
+                time.sleep(5)
+
+    def _dispatch(self, message):
+        channel = message.get('channel')
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            payload = json.loads(message.get('data'))
+            if payload['origin'] != self._origin:
+                handler[0](payload['data'])
+        except Exception:
+            logger.warning("Mensaje inválido en %s: %r", channel, message.get('data'), exc_info=True)
+
+
+broadcast = ProcessBroadcast()
+
+
+# ---------------------------------------------------------------------------
+# Caché de objetos en dos niveles
+# ---------------------------------------------------------------------------
+
+OBJECT_CACHE_CHANNEL = 'object-cache'
+
+# Namespaces de object_cache
+CATEGORIES_CACHE = 'categories'
+PLACE_DETAIL_CACHE = 'place-detail'
+PROFILE_CACHE = 'profiles'
+
+_MISSING = object()
+
+
+class LocalLRU:
+    """LRU en memoria del proceso con límite de entradas y TTL"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def drop(self, namespace, key=None):
+        """Borrar las entradas de ``namespace`` (o solo las de ``key``)"""
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace and (key is None or k[1] == key)]:
+                del self._entries[entry_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ObjectCache:
+    """
+    Caché de objetos de lectura frecuente (categorías, detalle de lugares,
+    perfiles): un LRU por proceso con TTL corto delante de la caché
+    ``default`` (Redis).
+
+    Las entradas se identifican por (namespace, key, variant): ``key`` es la
+    unidad de invalidación (p. ej. el id del lugar) y ``variant`` distingue
+    representaciones del mismo objeto (host, query string). Las claves en
+    Redis incluyen las versiones del namespace y de la key (ver
+    ``tag_versions``), así que invalidar es incrementar una versión. Cada
+    invalidación se publica a los demás procesos (``broadcast``) para que
+    borren su LRU; sin Redis, el TTL local acota cuánto puede durar una
+    entrada vieja en otro proceso.
+    """
+
+    def __init__(self):
+        self._local = None
+        self._lock = threading.RLock()
+        self._stats = defaultdict(lambda: defaultdict(int))
+        broadcast.subscribe(OBJECT_CACHE_CHANNEL, self._handle_message, on_reset=self._reset_local)
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'OBJECT_CACHE_ENABLED', True)
+
+    @property
+    def local(self):
+        if self._local is None:
+            with self._lock:
+                if self._local is None:
+                    self._local = LocalLRU(
+                        getattr(settings, 'OBJECT_CACHE_LOCAL_MAX_ENTRIES', 2000),
+                        getattr(settings, 'OBJECT_CACHE_LOCAL_TTL', 30),
+                    )
+        return self._local
+
+    def _reset_local(self):
+        # Mientras no hay suscripción las entradas locales pueden quedar viejas
+        self.local.clear()
+
+    def _count(self, namespace, metric):
+        self._stats[namespace][metric] += 1
+
+    def _remote_key(self, namespace, key, variant):
+        versions = '.'.join(str(version) for version in tag_versions([namespace, f'{namespace}:{key}']))
+        digest = hashlib.sha1(str(variant).encode('utf-8')).hexdigest()
+        return f'obj:{namespace}:{key}:{versions}:{digest}'
+
+    def get_or_set(self, namespace, key, variant, loader):
+        """Valor cacheado de (namespace, key, variant); si no está, ``loader()``"""
+        if not self.enabled:
+            return loader()
+        broadcast.ensure_started()
+
+        local_key = (namespace, str(key), str(variant))
+        value = self.local.get(local_key)
+        if value is not _MISSING:
+            self._count(namespace, 'local_hits')
+            return value
+
+        try:
+            remote_key = self._remote_key(namespace, key, variant)
+            value = cache.get(remote_key, _MISSING)
+        except Exception:
+            logger.warning("No se pudo leer la caché de objetos", exc_info=True)
+            remote_key, value = None, _MISSING
+
+        if value is not _MISSING:
+            self._count(namespace, 'remote_hits')
+        else:
+            self._count(namespace, 'misses')
+            value = loader()
+            if remote_key is not None:
+                set_result(remote_key, value, getattr(settings, 'OBJECT_CACHE_TIMEOUT', 300))
+        self.local.set(local_key, value)
+        return value
+
+    def invalidate(self, namespace, key=None):
+        """Invalidar ``key`` del namespace (o todo el namespace) en todos los procesos"""
+        self._count(namespace, 'invalidations')
+        invalidate_tags(namespace if key is None else f'{namespace}:{key}')
+        key = None if key is None else str(key)
+        self.local.drop(namespace, key)
+        self._publish(namespace, key)
+
+    def invalidate_on_commit(self, namespace, key=None):
+        transaction.on_commit(lambda: self.invalidate(namespace, key))
+
+    def stats(self):
+        """Métricas de este proceso por namespace"""
+        namespaces = {}
+        for namespace, counts in self._stats.items():
+            lookups = counts['local_hits'] + counts['remote_hits'] + counts['misses']
+            namespaces[namespace] = {
+                **counts,
+                'hit_rate': round((lookups - counts['misses']) / lookups, 4) if lookups else None,
+            }
+        return {
+            'enabled': self.enabled,
+            'local_entries': len(self.local),
+            'local_max_entries': self.local.max_entries,
+            'local_evictions': self.local.evictions,
+            'pubsub': broadcast.running,
+            'namespaces': namespaces,
+        }
+
+    # Invalidaciones entre procesos
+
+    def _publish(self, namespace, key):
+        broadcast.publish(OBJECT_CACHE_CHANNEL, {'namespace': namespace, 'key': key})
+
+    def _handle_message(self, data):
+        self.local.drop(data['namespace'], data.get('key'))
+
+
+object_cache = ObjectCache()
@@ -0,0 +1,78 @@
+"""
+Agrupación de lugares en el servidor para vistas de mapa alejadas.
+
+Cada Place guarda su quadkey al nivel QUADKEY_ZOOM; el prefijo de longitud z
+es la tesela de ese zoom, así que agrupar por un prefijo equivale a agrupar en
+una grilla precalculada sin recorrer los lugares en Python.
+"""
+from django.db.models import Avg, Count
+from django.db.models.functions import Substr
+
+from .geo import QUADKEY_ZOOM, filter_by_bbox
+
+# Celdas de cluster = teselas de (zoom + offset): 4x4 celdas por tesela de 256px
+CLUSTER_ZOOM_OFFSET = 2
+
+
+def cluster_zoom(zoom):
+    return max(1, min(zoom + CLUSTER_ZOOM_OFFSET, QUADKEY_ZOOM))
+
+
+def cluster_places(queryset, bbox, zoom):
+    """
+    Devolver los clusters de ``queryset`` dentro de ``bbox`` para el zoom dado:
+    cantidad, centroide, categoría dominante y, si el cluster tiene un único
+    lugar, su id. Son dos consultas agregadas, más una para resolver los ids
+    de los clusters de un solo lugar.
+    """
+    cell_zoom = cluster_zoom(zoom)
+    cells = filter_by_bbox(queryset, *bbox).annotate(cell=Substr('quadkey', 1, cell_zoom))
+
+    clusters = {
+        row['cell']: row
+        for row in cells.values('cell').annotate(
+            count=Count('id'),
+            center_lat=Avg('latitude'),
+            center_lon=Avg('longitude'),
+        ).order_by()
+    }
+
+    # Categoría más frecuente de cada celda
+    dominant = {}
+    category_rows = cells.values(
+        'cell', 'category_id', 'category__name', 'category__icon', 'category__color'
+    ).annotate(total=Count('id')).order_by()
+    for row in category_rows:
+        current = dominant.get(row['cell'])
+        if current is None or row['total'] > current['total']:
+            dominant[row['cell']] = row
+
+    single_ids = {}
+    single_cells = [cell for cell, row in clusters.items() if row['count'] == 1]
+    if single_cells:
+        single_ids = dict(cells.filter(cell__in=single_cells).values_list('cell', 'id').order_by())
+
+    results = []
+    for cell, row in clusters.items():
+        category = dominant.get(cell)
+        results.append({
+            'key': cell,
+            'count': row['count'],
+            'latitude': round(float(row['center_lat']), 6),
+            'longitude': round(float(row['center_lon']), 6),
+            'category': {
+                'id': category['category_id'],
+                'name': category['category__name'],
+                'icon': category['category__icon'],
+                'color': category['category__color'],
+            } if category else None,
+            'place_id': str(single_ids[cell]) if cell in single_ids else None,
+        })
+
+    results.sort(key=lambda cluster: cluster['count'], reverse=True)
+    return {
+        'zoom': zoom,
+        'cell_zoom': cell_zoom,
+        'total': sum(cluster['count'] for cluster in results),
+        'clusters': results,
+    }
@@ -0,0 +1,41 @@
+"""
+WebSocket de eventos para usuarios de negocio: nuevas reservas, cambios de
+estado y nuevas reseñas de sus lugares (ver events.py), en lugar de
+consultar business/reservations/ periódicamente.
+
+    ws://<host>/ws/business/events/?token=<access token>
+
+Cada evento llega como un mensaje JSON con ``type`` (reservation.created,
+reservation.status_changed, review.created). Sin token válido o si el
+usuario no es de negocio se rechaza el handshake.
+"""
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import business_group
+
+
+class BusinessEventsConsumer(AsyncJsonWebsocketConsumer):
+
+    async def connect(self):
+        user = self.scope.get('user')
+        self.group_name = None
+        # Cerrar antes de aceptar rechaza el handshake (HTTP 403)
+        if user is None or not user.is_authenticated or user.role != 'BUSINESS':
+            await self.close()
+            return
+        self.group_name = business_group(user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Keepalive desde el cliente
+        if content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def business_events(self, message):
+        for event in message['events']:
+            await self.send_json(event)
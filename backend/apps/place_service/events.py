@@ -0,0 +1,107 @@
+"""
+Eventos en tiempo real para los usuarios de negocio (WebSocket, ver
+consumers.py).
+
+Cada usuario de negocio escucha el grupo ``business_<user_id>`` de la capa
+de canales. Las señales de Reservation y Review (y las transiciones en lote,
+que no disparan señales) publican aquí; los destinatarios salen de
+BusinessPlaceAccess con una consulta y los mensajes se envían al confirmar
+la transacción, uno por usuario con todos sus eventos.
+"""
+import logging
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+from .access import scope_key, scope_keys
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_CREATED = 'reservation.created'
+RESERVATION_STATUS_CHANGED = 'reservation.status_changed'
+REVIEW_CREATED = 'review.created'
+
+
+def business_group(user_id):
+    return f'business_{user_id}'
+
+
+def reservation_event(event_type, reservation, previous_status=None):
+    event = {
+        'type': event_type,
+        'reservation': {
+            'id': str(reservation.pk),
+            'place_id': str(reservation.place_id) if reservation.place_id else None,
+            'google_place_id': reservation.google_place_id,
+            'status': reservation.status,
+            'reservation_date': str(reservation.reservation_date),
+            'reservation_time': str(reservation.reservation_time),
+            'party_size': reservation.party_size,
+            'contact_name': reservation.contact_name,
+            'confirmation_code': reservation.confirmation_code,
+        },
+    }
+    if previous_status is not None:
+        event['previous_status'] = previous_status
+    return event
+
+
+def review_event(review):
+    return {
+        'type': REVIEW_CREATED,
+        'review': {
+            'id': str(review.pk),
+            'place_id': str(review.place_id) if review.place_id else None,
+            'google_place_id': review.google_place_id,
+            'rating': review.rating,
+            'title': review.title,
+            'created_at': review.created_at.isoformat() if review.created_at else None,
+        },
+    }
+
+
+def _recipients(place_ids, google_place_ids):
+    """``{scope_key: {user_id}}`` desde BusinessPlaceAccess"""
+    from .models import BusinessPlaceAccess
+
+    recipients = defaultdict(set)
+    for user_id, key in BusinessPlaceAccess.objects.filter(
+        scope_key__in=scope_keys(place_ids, google_place_ids)
+    ).values_list('user_id', 'scope_key'):
+        recipients[key].add(user_id)
+    return recipients
+
+
+def _send(messages):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    for user_id, events in messages.items():
+        try:
+            async_to_sync(channel_layer.group_send)(
+                business_group(user_id), {'type': 'business.events', 'events': events}
+            )
+        except Exception:
+            logger.warning("No se pudieron publicar eventos para el negocio %s", user_id, exc_info=True)
+
+
+def publish_business_events(events):
+    """
+    Publicar al confirmar ``events``, lista de ``(place_id, google_place_id,
+    evento)``, a los negocios con acceso al lugar.
+    """
+    place_ids = {place_id for place_id, _, _ in events if place_id}
+    google_place_ids = {google_place_id for _, google_place_id, _ in events if google_place_id}
+    if not place_ids and not google_place_ids:
+        return
+    recipients = _recipients(place_ids, google_place_ids)
+
+    messages = defaultdict(list)
+    for place_id, google_place_id, event in events:
+        users = recipients.get(scope_key(place_id, None), set()) | recipients.get(google_place_id, set())
+        for user_id in users:
+            messages[user_id].append(event)
+    if messages:
+        transaction.on_commit(lambda: _send(messages))
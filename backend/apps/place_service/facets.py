@@ -0,0 +1,65 @@
+"""
+Conteos por faceta para los filtros del buscador de lugares.
+
+Cada faceta es un GROUP BY en la base de datos sobre los lugares del queryset
+ya filtrado (un subquery por id), así nunca se traen filas a Python.
+features y cuisines se cuentan sobre PlaceAttribute, los mismos valores
+normalizados contra los que filtran ?features= y ?cuisines=.
+"""
+from django.db.models import Count
+
+# faceta -> columna de Place por la que se agrupa
+FACET_COLUMNS = {
+    'category': 'category_id',
+    'price_range': 'price_range',
+    'city': 'city',
+}
+# faceta -> PlaceAttribute.kind
+ATTRIBUTE_FACETS = {
+    'features': 'feature',
+    'cuisines': 'cuisine',
+}
+
+
+def parse_facets(value):
+    """
+    Parse ``category,price_range`` into a list of facet names.
+    Raises ValueError for unknown facets.
+    """
+    facets = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in facets if name not in FACET_COLUMNS and name not in ATTRIBUTE_FACETS]
+    if unknown:
+        raise ValueError(f"Unknown facets: {', '.join(unknown)}")
+    return list(dict.fromkeys(facets))
+
+
+def facet_counts(queryset, facets):
+    """
+    ``{faceta: [{'value', 'label'?, 'count'}]}`` ordenado por conteo para los
+    lugares de ``queryset``; una consulta agregada por faceta.
+    """
+    from .models import Place, PlaceAttribute
+
+    # Solo los ids: las anotaciones y el orden del listado no entran al GROUP BY
+    place_ids = queryset.order_by().values('pk')
+    result = {}
+    for name in facets:
+        if name in ATTRIBUTE_FACETS:
+            rows = PlaceAttribute.objects.filter(
+                kind=ATTRIBUTE_FACETS[name], place__in=place_ids
+            ).values_list('value').annotate(count=Count('id')).order_by('-count', 'value')
+            result[name] = [{'value': value, 'count': count} for value, count in rows]
+        elif name == 'category':
+            rows = Place.objects.filter(pk__in=place_ids).values_list(
+                'category_id', 'category__name'
+            ).annotate(count=Count('id')).order_by('-count', 'category_id')
+            result[name] = [
+                {'value': value, 'count': count, 'label': label} for value, label, count in rows
+            ]
+        else:
+            column = FACET_COLUMNS[name]
+            rows = Place.objects.filter(pk__in=place_ids).values_list(column).annotate(
+                count=Count('id')
+            ).order_by('-count', column)
+            result[name] = [{'value': value, 'count': count} for value, count in rows]
+    return result
@@ -0,0 +1,158 @@
+"""
+Representaciones rápidas para listados de alto tráfico.
+
+``ModelSerializer`` recorre sus campos por cada fila (get_attribute, checks de
+None, to_representation de cada Field). Para los listados de lugares y
+reseñas esto domina el tiempo de CPU, así que aquí cada fila se convierte en
+un dict con acceso directo a los atributos, en el mismo orden de claves y con
+los mismos formatos que el serializer de DRF. Los formatos de fecha y
+decimales reutilizan los Field de DRF para respetar la configuración
+(DATETIME_FORMAT, zona horaria, COERCE_DECIMAL_TO_STRING).
+
+Cada representación es una tabla ordenada campo -> función; con
+``?fields=``/``?omit=`` solo se evalúan las funciones de los campos pedidos.
+Se conectan con ``Meta.list_serializer_class = FastListSerializer`` y un
+atributo ``fast_representation`` en el serializer hijo; cualquier
+``Serializer(queryset, many=True)`` usa entonces este camino.
+"""
+from django.db import models
+from rest_framework import serializers
+
+_datetime_field = serializers.DateTimeField()
+_date_field = serializers.DateField()
+_coordinate_field = serializers.DecimalField(max_digits=9, decimal_places=6)
+_rating_field = serializers.DecimalField(max_digits=3, decimal_places=2)
+
+
+def _datetime(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def _date(value):
+    return None if value is None else _date_field.to_representation(value)
+
+
+def _decimal(value, field):
+    return None if value is None else field.to_representation(value)
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+class RowRepresentation:
+    """Tabla ordenada campo -> función que construye el dict de una fila"""
+
+    def __init__(self, getters):
+        self.getters = getters
+
+    def __call__(self, obj):
+        return {name: getter(obj) for name, getter in self.getters.items()}
+
+    def only(self, names):
+        """Representación restringida a ``names`` (en el orden original)"""
+        return RowRepresentation({
+            name: getter for name, getter in self.getters.items() if name in names
+        })
+
+
+class FastListSerializer(serializers.ListSerializer):
+    """ListSerializer que usa ``child.fast_representation`` por fila"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        represent = self.child.fast_representation
+        # ?fields= / ?omit= (ver fieldsets.SparseFieldsetMixin)
+        select = getattr(self.child, 'requested_field_names', None)
+        names = select(represent.getters) if select is not None else None
+        if names is not None:
+            represent = represent.only(names)
+        return [represent(item) for item in iterable]
+
+
+def category_representation(category):
+    """Igual que PlaceCategorySerializer"""
+    return {
+        'id': category.id,
+        'name': category.name,
+        'icon': category.icon,
+        'color': category.color,
+        'description': category.description,
+    }
+
+
+def _distance(place):
+    distance = getattr(place, 'distance', None)
+    return round(distance, 2) if distance is not None else None
+
+
+# Igual que PlaceListSerializer
+place_list_representation = RowRepresentation({
+    'id': lambda place: str(place.id),
+    'name': lambda place: place.name,
+    'description': lambda place: place.description,
+    'category': lambda place: category_representation(place.category),
+    'latitude': lambda place: _decimal(place.latitude, _coordinate_field),
+    'longitude': lambda place: _decimal(place.longitude, _coordinate_field),
+    'address': lambda place: place.address,
+    'city': lambda place: place.city,
+    'price_range': lambda place: place.price_range,
+    'average_rating': lambda place: _decimal(place.average_rating, _rating_field),
+    'total_reviews': lambda place: place.total_reviews,
+    'primary_image': lambda place: place.primary_image_url or None,
+    'distance': _distance,
+    'features': lambda place: place.features,
+    'isGooglePlace': lambda place: bool(place.google_place_id),
+    'google_place_id': lambda place: place.google_place_id,
+})
+
+
+def _user_name(review):
+    return _str(review.user.get_full_name()) if review.user is not None else None
+
+
+def _user_email(review):
+    return _str(review.user.email) if review.user is not None else None
+
+
+# Igual que ReviewSerializer
+review_representation = RowRepresentation({
+    'id': lambda review: review.id,
+    'user': lambda review: review.user_id,
+    'user_name': _user_name,
+    'user_email': _user_email,
+    'place': lambda review: review.place_id,
+    'place_name': lambda review: review.place_name,
+    'place_address': lambda review: review.place_address,
+    'google_place_id': lambda review: review.google_place_id,
+    'google_place_name': lambda review: review.google_place_name,
+    'google_place_address': lambda review: review.google_place_address,
+    'is_google_place': lambda review: review.is_google_place,
+    'rating': lambda review: review.rating,
+    'title': lambda review: review.title,
+    'content': lambda review: review.content,
+    'visited_date': lambda review: _date(review.visited_date),
+    'would_recommend': lambda review: review.would_recommend,
+    'created_at': lambda review: _datetime(review.created_at),
+    'updated_at': lambda review: _datetime(review.updated_at),
+    'is_approved': lambda review: review.is_approved,
+    'is_featured': lambda review: review.is_featured,
+})
+
+# Igual que GoogleReviewSerializer
+google_review_representation = RowRepresentation({
+    'id': lambda review: review.id,
+    'google_place_id': lambda review: review.google_place_id,
+    'place_name': lambda review: review.place_name,
+    'reviewer_name': lambda review: review.reviewer_name,
+    'reviewer_avatar_url': lambda review: review.reviewer_avatar_url,
+    'reviewer_review_count': lambda review: review.reviewer_review_count,
+    'rating': lambda review: review.rating,
+    'review_text': lambda review: review.review_text,
+    'review_date': lambda review: _datetime(review.review_date),
+    'is_verified': lambda review: review.is_verified,
+    'helpful_count': lambda review: review.helpful_count,
+    'business_response': lambda review: review.business_response,
+    'business_response_date': lambda review: _datetime(review.business_response_date),
+    'scraped_at': lambda review: _datetime(review.scraped_at),
+})
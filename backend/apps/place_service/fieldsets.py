@@ -0,0 +1,84 @@
+"""
+Sparse fieldsets: ``?fields=id,name`` y ``?omit=description`` en GET.
+
+``SparseFieldsetViewMixin`` lee los parámetros, los pasa al serializer por el
+contexto y ajusta ``select_related``/``prefetch_related`` del queryset para
+cargar solo las relaciones de los campos pedidos. ``SparseFieldsetMixin``
+(serializers) descarta los campos no pedidos, así que tampoco se serializan.
+"""
+
+
+def _parse_names(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Serializer que respeta ``sparse_fields``/``sparse_omit`` del contexto"""
+
+    def requested_field_names(self, names):
+        """Subconjunto de ``names`` pedido, o None si no hay ?fields=/?omit="""
+        fields = self.context.get('sparse_fields')
+        omit = self.context.get('sparse_omit')
+        if fields is None and omit is None:
+            return None
+        return [
+            name for name in names
+            if (fields is None or name in fields) and (omit is None or name not in omit)
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        names = self.requested_field_names(fields)
+        if names is None:
+            return fields
+        return {name: fields[name] for name in names}
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet con ?fields=/?omit=. ``sparse_select_related`` y
+    ``sparse_prefetch_related`` indican qué relaciones necesita cada campo
+    del serializer; las de campos omitidos no se cargan.
+    """
+    sparse_select_related = {}
+    sparse_prefetch_related = {}
+
+    def get_sparse_fieldset(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return None, None
+        return (
+            _parse_names(request.query_params.get('fields')),
+            _parse_names(request.query_params.get('omit')),
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'], context['sparse_omit'] = self.get_sparse_fieldset()
+        return context
+
+    def _wanted_relations(self, relations, names, fields, omit):
+        wanted = []
+        for name in names:
+            if name in relations and (fields is None or name in fields) and (omit is None or name not in omit):
+                wanted.extend(relation for relation in relations[name] if relation not in wanted)
+        return wanted
+
+    def apply_sparse_relations(self, queryset):
+        """Cargar solo las relaciones de los campos pedidos"""
+        fields, omit = self.get_sparse_fieldset()
+        if fields is None and omit is None:
+            return queryset
+
+        names = getattr(self.get_serializer_class().Meta, 'fields', ())
+        select = self._wanted_relations(self.sparse_select_related, names, fields, omit)
+        prefetch = self._wanted_relations(self.sparse_prefetch_related, names, fields, omit)
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,25 @@
+from rest_framework import filters
+
+
+class PlaceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter que ordena por relevancia cuando el queryset viene anotado
+    con ``search_rank`` (parámetro q) y por distancia cuando viene anotado con
+    ``distance`` (la petición incluye latitude/longitude).
+    """
+    annotated_fields = ['search_rank', 'distance']
+    default_directions = {'search_rank': '-search_rank', 'distance': 'distance'}
+
+    def _annotated(self, queryset):
+        return [field for field in self.annotated_fields if field in queryset.query.annotations]
+
+    def get_valid_fields(self, queryset, view, context=None):
+        valid_fields = super().get_valid_fields(queryset, view, context or {})
+        valid_fields.extend((field, field) for field in self._annotated(queryset))
+        return valid_fields
+
+    def get_ordering(self, request, queryset, view):
+        annotated = self._annotated(queryset)
+        if annotated and not request.query_params.get(self.ordering_param):
+            return [self.default_directions[field] for field in annotated]
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,128 @@
+"""
+Utilidades geoespaciales para búsquedas por ubicación.
+
+Las distancias se calculan en la base de datos con la fórmula de haversine,
+de modo que los resultados sigan siendo un QuerySet (paginación, filtros y
+búsqueda de DRF siguen funcionando).
+"""
+import math
+
+from django.db.models import FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.045
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, min_lon, max_lat, max_lon) enclosing a circle of
+    ``radius_km`` around the given point. Used as an index-friendly prefilter
+    before the exact haversine distance is computed.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6:
+        lon_delta = 180.0
+    else:
+        lon_delta = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+
+    return (
+        max(latitude - lat_delta, -90.0),
+        max(longitude - lon_delta, -180.0),
+        min(latitude + lat_delta, 90.0),
+        min(longitude + lon_delta, 180.0),
+    )
+
+
+def parse_bbox(value):
+    """
+    Parse ``minLat,minLon,maxLat,maxLon`` into a tuple of floats.
+    Raises ValueError when the value is malformed or out of range.
+    """
+    parts = [float(part) for part in value.split(',')]
+    if len(parts) != 4:
+        raise ValueError('bbox must have four comma separated values')
+    min_lat, min_lon, max_lat, max_lon = parts
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= max_lon <= 180):
+        raise ValueError('bbox is out of range')
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def filter_by_bbox(queryset, min_lat, min_lon, max_lat, max_lon):
+    """Restrict ``queryset`` to places inside the bounding box"""
+    return queryset.filter(
+        latitude__gte=min_lat,
+        latitude__lte=max_lat,
+        longitude__gte=min_lon,
+        longitude__lte=max_lon,
+    )
+
+
+def haversine_expression(latitude, longitude, lat_field='latitude', lon_field='longitude'):
+    """Database expression with the great-circle distance in km to the given point"""
+    place_lat = Radians(Cast(lat_field, FloatField()))
+    place_lon = Radians(Cast(lon_field, FloatField()))
+    origin_lat = math.radians(latitude)
+    origin_lon = math.radians(longitude)
+
+    half_dlat = (place_lat - Value(origin_lat)) / Value(2.0)
+    half_dlon = (place_lon - Value(origin_lon)) / Value(2.0)
+    a = (
+        Power(Sin(half_dlat), 2)
+        + Value(math.cos(origin_lat)) * Cos(place_lat) * Power(Sin(half_dlon), 2)
+    )
+    # Acotar a 1: el redondeo puede dejar ``a`` apenas por encima en puntos
+    # antipodales o idénticos y ASIN devolvería NULL (igual que spatial_index)
+    a = Least(a, Value(1.0), output_field=FloatField())
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
+
+
+def filter_by_radius(queryset, latitude, longitude, radius_km):
+    """
+    Restrict ``queryset`` to places within ``radius_km`` of the point and
+    annotate each row with its ``distance`` in km.
+
+    The bounding box filter runs first so the (latitude, longitude) index can
+    discard most rows before the haversine expression is evaluated.
+    """
+    queryset = filter_by_bbox(queryset, *bounding_box(latitude, longitude, radius_km))
+    return queryset.annotate(
+        distance=haversine_expression(latitude, longitude)
+    ).filter(distance__lte=radius_km)
+
+
+# ============ QUADKEYS PARA AGRUPAR LUGARES EN EL MAPA ============
+
+# Nivel de zoom máximo almacenado en Place.quadkey (~38 m por celda)
+QUADKEY_ZOOM = 20
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def quadkey_for(latitude, longitude, zoom=QUADKEY_ZOOM):
+    """
+    Quadkey (Web Mercator, esquema de Bing Maps) de la tesela que contiene el
+    punto. Cada prefijo de longitud z identifica la tesela del zoom z, por lo
+    que un solo valor sirve como grilla multi-resolución.
+    """
+    latitude = min(max(float(latitude), -MAX_MERCATOR_LAT), MAX_MERCATOR_LAT)
+    longitude = min(max(float(longitude), -180.0), 180.0)
+
+    sin_lat = math.sin(math.radians(latitude))
+    x = (longitude + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+
+    map_size = 1 << zoom
+    tile_x = min(max(int(x * map_size), 0), map_size - 1)
+    tile_y = min(max(int(y * map_size), 0), map_size - 1)
+
+    digits = []
+    for level in range(zoom, 0, -1):
+        mask = 1 << (level - 1)
+        digit = 0
+        if tile_x & mask:
+            digit += 1
+        if tile_y & mask:
+            digit += 2
+        digits.append(str(digit))
+    return ''.join(digits)
@@ -0,0 +1,86 @@
+"""
+Leaderboards materializados de lugares ("top en <ciudad>", "top <categoría>
+en <ciudad>").
+
+Cada lugar activo tiene una fila PlaceLeaderboardEntry en tres tableros:
+su ciudad, su categoría y ciudad×categoría, con su rank_score (ranking.py).
+Leer el top-K es un recorrido de K filas del índice (board, -score) en
+lugar de filtrar y ordenar Place. Las señales de Place sincronizan las filas
+cuando cambian rank_score, ciudad, categoría o is_active;
+``rebuild_leaderboards`` las regenera todas.
+"""
+from django.db import transaction
+
+# Máximo de lugares por lectura de un tablero
+MAX_LEADERBOARD_SIZE = 50
+
+
+def normalize_city(city):
+    return ' '.join((city or '').split()).casefold()
+
+
+def board_key(city=None, category_id=None):
+    """Clave del tablero para una ciudad, una categoría o ambas"""
+    parts = []
+    if city:
+        parts.append(f'city:{normalize_city(city)}')
+    if category_id:
+        parts.append(f'category:{category_id}')
+    return '|'.join(parts)
+
+
+def place_boards(city, category_id, is_active=True):
+    """Tableros en los que aparece un lugar"""
+    if not is_active:
+        return []
+    boards = [board_key(category_id=category_id)]
+    if normalize_city(city):
+        boards += [board_key(city=city), board_key(city=city, category_id=category_id)]
+    return boards
+
+
+def sync_place_leaderboards(place):
+    """Actualizar las filas de un lugar en sus tableros"""
+    from .models import PlaceLeaderboardEntry
+
+    boards = place_boards(place.city, place.category_id, place.is_active)
+    with transaction.atomic():
+        entries = {entry.board: entry for entry in PlaceLeaderboardEntry.objects.filter(place_id=place.pk)}
+        stale = [entry.pk for board, entry in entries.items() if board not in boards]
+        if stale:
+            PlaceLeaderboardEntry.objects.filter(pk__in=stale).delete()
+        changed = [entries[board].pk for board in boards if board in entries and entries[board].score != place.rank_score]
+        if changed:
+            PlaceLeaderboardEntry.objects.filter(pk__in=changed).update(score=place.rank_score)
+        PlaceLeaderboardEntry.objects.bulk_create([
+            PlaceLeaderboardEntry(board=board, place_id=place.pk, score=place.rank_score)
+            for board in boards if board not in entries
+        ])
+
+
+def top_places(board, limit):
+    """Los ``limit`` mejores lugares del tablero, en orden (una consulta)"""
+    from .models import PlaceLeaderboardEntry
+
+    entries = PlaceLeaderboardEntry.objects.filter(board=board).select_related(
+        'place', 'place__category'
+    ).order_by('-score', 'place_id')[:limit]
+    return [entry.place for entry in entries]
+
+
+@transaction.atomic
+def rebuild_leaderboards(batch_size=1000):
+    """Regenerar todos los tableros desde Place"""
+    from .models import Place, PlaceLeaderboardEntry
+
+    PlaceLeaderboardEntry.objects.all().delete()
+    entries = []
+    for place_id, city, category_id, rank_score in Place.objects.filter(is_active=True).values_list(
+        'id', 'city', 'category_id', 'rank_score'
+    ).iterator():
+        entries.extend(
+            PlaceLeaderboardEntry(board=board, place_id=place_id, score=rank_score)
+            for board in place_boards(city, category_id)
+        )
+    PlaceLeaderboardEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.place_service.access import rebuild_business_access
+
+
+class Command(BaseCommand):
+    help = 'Regenera el alcance materializado de los usuarios de negocio (BusinessPlaceAccess)'
+
+    def handle(self, *args, **options):
+        total = rebuild_business_access()
+        self.stdout.write(self.style.SUCCESS(f'Alcance de negocios regenerado ({total} filas)'))
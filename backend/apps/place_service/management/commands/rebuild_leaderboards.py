@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.place_service.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Regenera los leaderboards por ciudad, categoría y ciudad×categoría (PlaceLeaderboardEntry)'
+
+    def handle(self, *args, **options):
+        total = rebuild_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f'Leaderboards regenerados ({total} entradas)'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.place_service.cache import RANKING_TAG, invalidate_tags
+from apps.place_service.ratings import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los agregados de calificación (PlaceRatingAggregate) y Place.average_rating / total_reviews'
+
+    def handle(self, *args, **options):
+        aggregates, updated = rebuild_rating_aggregates()
+        invalidate_tags(RANKING_TAG)
+        self.stdout.write(self.style.SUCCESS(
+            f'Agregados reconstruidos para {aggregates} lugares; {updated} lugares con calificación corregida'
+        ))
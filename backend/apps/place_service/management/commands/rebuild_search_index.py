@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.place_service.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice invertido y de trigramas de búsqueda de lugares (PlaceSearchToken, PlaceTrigram)'
+
+    def handle(self, *args, **options):
+        total = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Índice de búsqueda reconstruido para {total} lugares'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.place_service.cache import RANKING_TAG, invalidate_tags
+from apps.place_service.leaderboards import rebuild_leaderboards
+from apps.place_service.ranking import refresh_rank_scores
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Place.rank_score (calificación bayesiana + actividad con decaimiento) de todos los lugares'
+
+    def handle(self, *args, **options):
+        total = refresh_rank_scores()
+        # bulk_update no dispara señales: los leaderboards se regeneran aquí
+        entries = rebuild_leaderboards()
+        invalidate_tags(RANKING_TAG)
+        self.stdout.write(self.style.SUCCESS(
+            f'Ranking recalculado para {total} lugares ({entries} entradas de leaderboard)'
+        ))
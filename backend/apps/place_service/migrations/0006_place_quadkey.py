@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:17
+
+from django.db import migrations, models
+
+from apps.place_service.geo import quadkey_for
+
+
+def backfill_quadkeys(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    places = list(Place.objects.only('id', 'latitude', 'longitude'))
+    for place in places:
+        place.quadkey = quadkey_for(place.latitude, place.longitude)
+    Place.objects.bulk_update(places, ['quadkey'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0005_reservation_google_place_address_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='quadkey',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Quadkey de la tesela del lugar, usado para agrupar en el mapa', max_length=20),
+        ),
+        migrations.RunPython(backfill_quadkeys, migrations.RunPython.noop),
+    ]
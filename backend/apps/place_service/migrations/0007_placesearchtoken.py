@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.place_service.search import place_token_weights
+
+
+def build_search_index(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceSearchToken = apps.get_model('place_service', 'PlaceSearchToken')
+    tokens = []
+    for place_id, name, description, address, city in Place.objects.values_list(
+        'id', 'name', 'description', 'address', 'city'
+    ).iterator():
+        for token, weight in place_token_weights(name, description, address, city).items():
+            tokens.append(PlaceSearchToken(place_id=place_id, token=token, weight=weight))
+    PlaceSearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0006_place_quadkey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='place_service.place')),
+            ],
+            options={
+                'unique_together': {('token', 'place')},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
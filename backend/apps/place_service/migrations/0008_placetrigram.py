@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.place_service.search import place_trigram_rows
+
+
+def build_trigram_index(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceTrigram = apps.get_model('place_service', 'PlaceTrigram')
+    trigrams = []
+    for place_id, name, address in Place.objects.values_list('id', 'name', 'address').iterator():
+        for row in place_trigram_rows(name, address):
+            trigrams.append(PlaceTrigram(place_id=place_id, **row))
+    PlaceTrigram.objects.bulk_create(trigrams, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0007_placesearchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('name', 'Nombre'), ('address', 'Dirección')], max_length=10)),
+                ('trigram', models.CharField(max_length=3)),
+                ('field_size', models.PositiveSmallIntegerField()),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='place_service.place')),
+            ],
+            options={
+                'unique_together': {('trigram', 'field', 'place')},
+            },
+        ),
+        migrations.RunPython(build_trigram_index, migrations.RunPython.noop),
+    ]
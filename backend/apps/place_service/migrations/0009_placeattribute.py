@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.place_service.attributes import place_attribute_rows
+
+
+def build_place_attributes(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceAttribute = apps.get_model('place_service', 'PlaceAttribute')
+    attributes = []
+    for place_id, features, cuisines in Place.objects.values_list('id', 'features', 'cuisines').iterator():
+        for row in place_attribute_rows(features, cuisines):
+            attributes.append(PlaceAttribute(place_id=place_id, **row))
+    PlaceAttribute.objects.bulk_create(attributes, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0008_placetrigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceAttribute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('feature', 'Característica'), ('cuisine', 'Cocina')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attributes', to='place_service.place')),
+            ],
+            options={
+                'unique_together': {('kind', 'value', 'place')},
+            },
+        ),
+        migrations.RunPython(build_place_attributes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:30
+
+from django.db import migrations, models
+
+
+def backfill_primary_images(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceImage = apps.get_model('place_service', 'PlaceImage')
+    # Misma prioridad que PlaceImage.refresh_primary_image: principal y luego la primera
+    primary = {}
+    for place_id, image in PlaceImage.objects.order_by(
+        'place_id', '-is_primary', 'order', '-created_at'
+    ).values_list('place_id', 'image').iterator():
+        primary.setdefault(place_id, image)
+    for place_id, image in primary.items():
+        Place.objects.filter(pk=place_id).update(primary_image_url=image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0009_placeattribute'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='primary_image_url',
+            field=models.URLField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(backfill_primary_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:40
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+from apps.place_service.ratings import aggregate_fields, average_rating
+
+
+def build_rating_aggregates(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceReview = apps.get_model('place_service', 'PlaceReview')
+    Review = apps.get_model('place_service', 'Review')
+    PlaceRatingAggregate = apps.get_model('place_service', 'PlaceRatingAggregate')
+    # Mismas reseñas que ratings.review_contribution
+    counts = defaultdict(dict)
+    for queryset in (PlaceReview.objects.all(), Review.objects.filter(place__isnull=False, is_approved=True)):
+        rows = queryset.filter(rating__range=(1, 5)).order_by().values_list('place_id', 'rating').annotate(
+            count=Count('id')
+        )
+        for place_id, rating, count in rows:
+            counts[place_id][rating] = counts[place_id].get(rating, 0) + count
+    PlaceRatingAggregate.objects.bulk_create(
+        [PlaceRatingAggregate(place_id=place_id, **aggregate_fields(stars)) for place_id, stars in counts.items()],
+        batch_size=1000,
+    )
+    for place in Place.objects.only('id', 'average_rating', 'total_reviews').iterator():
+        fields = aggregate_fields(counts.get(place.pk, {}))
+        Place.objects.filter(pk=place.pk).update(
+            total_reviews=fields['review_count'],
+            average_rating=average_rating(fields['rating_sum'], fields['review_count']),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0010_place_primary_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceRatingAggregate',
+            fields=[
+                ('place', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_aggregate', serialize=False, to='place_service.place')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('star_1', models.PositiveIntegerField(default=0)),
+                ('star_2', models.PositiveIntegerField(default=0)),
+                ('star_3', models.PositiveIntegerField(default=0)),
+                ('star_4', models.PositiveIntegerField(default=0)),
+                ('star_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(build_rating_aggregates, migrations.RunPython.noop),
+    ]
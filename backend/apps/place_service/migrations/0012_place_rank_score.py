@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.place_service.ranking import (
+    activity_event_querysets, activity_scores, compute_prior_mean, compute_rank_score
+)
+
+
+def backfill_rank_scores(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceRatingAggregate = apps.get_model('place_service', 'PlaceRatingAggregate')
+    event_models = [
+        apps.get_model('place_service', name) for name in ('PlaceReview', 'Review', 'Favorite', 'Reservation')
+    ]
+    mean = compute_prior_mean(PlaceRatingAggregate.objects.all())
+    scores = activity_scores(activity_event_querysets(Place, *event_models))
+    for place_id, average_rating, total_reviews in Place.objects.values_list('id', 'average_rating', 'total_reviews').iterator():
+        activity = scores.get(place_id) or 0.0
+        Place.objects.filter(pk=place_id).update(
+            activity_score=activity,
+            rank_score=compute_rank_score(average_rating, total_reviews, activity, mean),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0011_placeratingaggregate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='activity_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='rank_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=models.Index(fields=['is_active', '-rank_score', 'id'], name='place_servi_is_acti_10d424_idx'),
+        ),
+        migrations.RunPython(backfill_rank_scores, migrations.RunPython.noop),
+    ]
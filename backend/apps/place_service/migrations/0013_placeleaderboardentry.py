@@ -0,0 +1,44 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.place_service.leaderboards import place_boards
+
+
+def build_leaderboards(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceLeaderboardEntry = apps.get_model('place_service', 'PlaceLeaderboardEntry')
+    entries = []
+    for place_id, city, category_id, rank_score in Place.objects.filter(is_active=True).values_list(
+        'id', 'city', 'category_id', 'rank_score'
+    ).iterator():
+        entries.extend(
+            PlaceLeaderboardEntry(board=board, place_id=place_id, score=rank_score)
+            for board in place_boards(city, category_id)
+        )
+    PlaceLeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0012_place_rank_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=150)),
+                ('score', models.FloatField()),
+                ('place', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='place_service.place')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-score', 'place'], name='place_servi_board_2f50ae_idx')],
+                'unique_together': {('board', 'place')},
+            },
+        ),
+        migrations.RunPython(build_leaderboards, migrations.RunPython.noop),
+    ]
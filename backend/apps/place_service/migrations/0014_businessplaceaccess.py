@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0013_placeleaderboardentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessPlaceAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('google_place_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['google_place_id'], name='place_servi_google__c8750f_idx'),
+        ),
+        migrations.AddField(
+            model_name='businessplaceaccess',
+            name='place',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='business_access', to='place_service.place'),
+        ),
+        migrations.AddField(
+            model_name='businessplaceaccess',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='place_access', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='businessplaceaccess',
+            constraint=models.UniqueConstraint(condition=models.Q(('place__isnull', False)), fields=('user', 'place'), name='unique_business_access_place'),
+        ),
+        migrations.AddConstraint(
+            model_name='businessplaceaccess',
+            constraint=models.UniqueConstraint(condition=models.Q(('google_place_id__isnull', False)), fields=('user', 'google_place_id'), name='unique_business_access_google_place'),
+        ),
+    ]
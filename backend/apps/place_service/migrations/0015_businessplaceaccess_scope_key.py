@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.place_service.access import all_access_rows
+
+
+def build_business_access(apps, schema_editor):
+    Place = apps.get_model('place_service', 'Place')
+    PlaceClaim = apps.get_model('place_service', 'PlaceClaim')
+    BusinessPlaceAccess = apps.get_model('place_service', 'BusinessPlaceAccess')
+    BusinessPlaceAccess.objects.all().delete()
+    rows = all_access_rows(Place, PlaceClaim, BusinessPlaceAccess)
+    BusinessPlaceAccess.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0014_businessplaceaccess'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='businessplaceaccess',
+            name='unique_business_access_place',
+        ),
+        migrations.RemoveConstraint(
+            model_name='businessplaceaccess',
+            name='unique_business_access_google_place',
+        ),
+        migrations.AddField(
+            model_name='businessplaceaccess',
+            name='scope_key',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(build_business_access, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='businessplaceaccess',
+            unique_together={('user', 'scope_key')},
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.place_service.access import backfill_reservation_scope_keys
+
+
+def fill_scope_keys(apps, schema_editor):
+    backfill_reservation_scope_keys(apps.get_model('place_service', 'Reservation'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place_service', '0015_businessplaceaccess_scope_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='scope_key',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_scope_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['scope_key'], name='place_servi_scope_k_37ffd7_idx'),
+        ),
+    ]
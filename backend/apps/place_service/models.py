@@ -3,6 +3,9 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 
+from .access import scope_key
+from .geo import QUADKEY_ZOOM, quadkey_for
+
 User = get_user_model()
 
 
@@ -45,6 +48,13 @@ class Place(models.Model):
     state = models.CharField(max_length=100)
     country = models.CharField(max_length=100)
     zip_code = models.CharField(max_length=20)
+    quadkey = models.CharField(
+        max_length=QUADKEY_ZOOM,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Quadkey de la tesela del lugar, usado para agrupar en el mapa"
+    )
     
     # Business Details
     phone = models.CharField(max_length=20, blank=True)
@@ -52,6 +62,10 @@ class Place(models.Model):
     website = models.URLField(blank=True)
     price_range = models.CharField(max_length=4, choices=PRICE_RANGE_CHOICES)
     
+    # Imagen principal desnormalizada (la marcada is_primary o la primera);
+    # la mantienen las señales de PlaceImage para no consultar por fila
+    primary_image_url = models.URLField(max_length=500, blank=True, editable=False)
+    
     # Features and Attributes
     features = models.JSONField(default=list)  # ["WiFi", "Parking", "Pet Friendly", etc.]
     cuisines = models.JSONField(default=list)  # For restaurants
@@ -60,6 +74,10 @@ class Place(models.Model):
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.00)
     total_reviews = models.PositiveIntegerField(default=0)
     
+    # Ranking precalculado para "populares" y el orden por defecto (ver ranking.py)
+    activity_score = models.FloatField(default=0, editable=False)
+    rank_score = models.FloatField(default=0, editable=False)
+    
     # Business Hours
     business_hours = models.JSONField(default=dict)  # {"monday": {"open": "09:00", "close": "18:00"}, ...}
     
@@ -177,11 +195,36 @@ class Place(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['city']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['is_active', '-rank_score', 'id']),
         ]
 
+    # Campos que mantienen las señales y los agregados, no los formularios
+    SCORE_FIELDS = ('average_rating', 'total_reviews', 'activity_score', 'rank_score')
+    DERIVED_FIELDS = SCORE_FIELDS + ('primary_image_url',)
+
     def __str__(self):
         return f"{self.name} - {self.city}"
 
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.quadkey = quadkey_for(self.latitude, self.longitude)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+                kwargs['update_fields'] = set(update_fields) | {'quadkey'}
+        if not self._state.adding and not args and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            # Un save() completo no escribe los campos derivados: los mantienen
+            # PlaceImage.refresh_primary_image, ratings.py y ranking.py con
+            # F()/select_for_update y el valor en memoria puede estar
+            # desactualizado. Se releen para que las señales vean los actuales
+            # y se escriben solo si se piden en update_fields.
+            self.refresh_from_db(fields=self.DERIVED_FIELDS)
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DERIVED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class PlaceImage(models.Model):
     place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='images')
@@ -197,6 +240,14 @@ class PlaceImage(models.Model):
     def __str__(self):
         return f"{self.place.name} - Image {self.order}"
 
+    @classmethod
+    def refresh_primary_image(cls, place_id):
+        """Recalcular Place.primary_image_url: la imagen principal o, si no hay, la primera"""
+        image = cls.objects.filter(place_id=place_id).order_by(
+            '-is_primary', 'order', '-created_at'
+        ).values_list('image', flat=True).first()
+        Place.objects.filter(pk=place_id).update(primary_image_url=image or '')
+
 
 class PlaceReview(models.Model):
     place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='reviews')
@@ -272,6 +323,9 @@ class Reservation(models.Model):
         null=True,
         help_text="Dirección del lugar de Google Places (solo para reservas de Google Places)"
     )
+    # Clave de alcance (access.scope_key): los endpoints de negocio filtran
+    # las reservas con un único IN contra BusinessPlaceAccess.scope_key
+    scope_key = models.CharField(max_length=255, blank=True, editable=False)
     
     # ============ GESTIÓN DEL NEGOCIO ============
     
@@ -335,6 +389,8 @@ class Reservation(models.Model):
             models.Index(fields=['place']),
             models.Index(fields=['reservation_date']),
             models.Index(fields=['status']),
+            models.Index(fields=['google_place_id']),
+            models.Index(fields=['scope_key']),
         ]
     
     def __str__(self):
@@ -345,6 +401,10 @@ class Reservation(models.Model):
             import random
             import string
             self.confirmation_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+        self.scope_key = scope_key(self.place_id, self.google_place_id) or ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'place', 'place_id', 'google_place_id'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'scope_key'}
         super().save(*args, **kwargs)
 
 
@@ -787,3 +847,144 @@ class Favorite(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.place.name}"
+
+
+# ============ ÍNDICES DE BÚSQUEDA ============
+
+class PlaceSearchToken(models.Model):
+    """
+    Índice invertido para la búsqueda de lugares: un término normalizado
+    (sin tildes, con stemming) por lugar, con su peso acumulado por campo.
+    Se mantiene desde las señales de Place (ver search.py).
+    """
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ['token', 'place']
+
+    def __str__(self):
+        return f"{self.token} -> {self.place_id} ({self.weight})"
+
+
+class PlaceTrigram(models.Model):
+    """
+    Índice de trigramas para la búsqueda tolerante a errores de tipeo sobre
+    el nombre y la dirección. ``field_size`` es el total de trigramas del
+    campo, necesario para calcular la similitud sin leer el texto original.
+    """
+    NAME = 'name'
+    ADDRESS = 'address'
+    FIELD_CHOICES = [
+        (NAME, 'Nombre'),
+        (ADDRESS, 'Dirección'),
+    ]
+
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='trigrams')
+    field = models.CharField(max_length=10, choices=FIELD_CHOICES)
+    trigram = models.CharField(max_length=3)
+    field_size = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ['trigram', 'field', 'place']
+
+    def __str__(self):
+        return f"{self.trigram!r} -> {self.place_id} ({self.field})"
+
+
+class PlaceAttribute(models.Model):
+    """
+    Valores de Place.features y Place.cuisines normalizados en filas, para
+    filtrar por características con un índice (kind, value) en lugar de
+    recorrer los arreglos JSON. Se mantiene desde las señales de Place.
+    """
+    FEATURE = 'feature'
+    CUISINE = 'cuisine'
+    KIND_CHOICES = [
+        (FEATURE, 'Característica'),
+        (CUISINE, 'Cocina'),
+    ]
+
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='attributes')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ['kind', 'value', 'place']
+
+    def __str__(self):
+        return f"{self.kind}:{self.value} -> {self.place_id}"
+
+
+class PlaceRatingAggregate(models.Model):
+    """
+    Conteo, suma e histograma de estrellas de las reseñas de un lugar
+    (PlaceReview y Review aprobadas). Se actualiza con F() en cada alta,
+    cambio o baja de reseña desde las señales, y de aquí se derivan
+    Place.average_rating y Place.total_reviews (ver ratings.py).
+    """
+    place = models.OneToOneField(
+        Place, on_delete=models.CASCADE, primary_key=True, related_name='rating_aggregate'
+    )
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    star_1 = models.PositiveIntegerField(default=0)
+    star_2 = models.PositiveIntegerField(default=0)
+    star_3 = models.PositiveIntegerField(default=0)
+    star_4 = models.PositiveIntegerField(default=0)
+    star_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.place_id}: {self.review_count} reseñas"
+
+    @property
+    def histogram(self):
+        return {str(stars): getattr(self, f'star_{stars}') for stars in range(1, 6)}
+
+
+class PlaceLeaderboardEntry(models.Model):
+    """
+    Leaderboards materializados por ciudad, categoría y ciudad×categoría:
+    una fila por lugar activo y tablero con su rank_score, indexada por
+    (board, -score) para que el top-K sea un recorrido de K filas del índice.
+    Se mantiene desde las señales de Place (ver leaderboards.py).
+    """
+    board = models.CharField(max_length=150)
+    place = models.ForeignKey(Place, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ['board', 'place']
+        indexes = [
+            models.Index(fields=['board', '-score', 'place']),
+        ]
+
+    def __str__(self):
+        return f"{self.board}: {self.place_id} ({self.score:.2f})"
+
+
+class BusinessPlaceAccess(models.Model):
+    """
+    Alcance materializado de un usuario de negocio: una fila por lugar que
+    gestiona (place) o por Google Place ID de un claim aprobado sin lugar
+    vinculado (google_place_id). Se regenera por usuario cuando cambian sus
+    claims o el claimed_by de sus lugares (ver access.py), de modo que los
+    endpoints de negocio leen el alcance con una sola consulta por índice.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='place_access')
+    place = models.ForeignKey(
+        Place, on_delete=models.CASCADE, related_name='business_access', null=True, blank=True
+    )
+    google_place_id = models.CharField(max_length=255, null=True, blank=True)
+    # str(place_id) o google_place_id: clave no nula para la unicidad por
+    # usuario (MySQL no soporta UniqueConstraint con condición)
+    scope_key = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['user', 'scope_key']
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.place_id or self.google_place_id}"
@@ -0,0 +1,58 @@
+"""
+Notificaciones por email a los clientes cuando el negocio cambia el estado
+de sus reservas. Se encolan al confirmar la transacción y salen en un solo
+lote (send_mass_mail abre una única conexión SMTP) desde un hilo aparte, para
+que la respuesta no espere al servidor SMTP. Desactivadas salvo que
+RESERVATION_EMAIL_NOTIFICATIONS esté activo.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+STATUS_SUBJECTS = {
+    'CONFIRMED': 'Tu reserva ha sido confirmada',
+    'REJECTED': 'Tu reserva ha sido rechazada',
+    'COMPLETED': 'Gracias por tu visita',
+    'NO_SHOW': 'Tu reserva se marcó como no presentada',
+}
+
+
+def reservation_message(reservation):
+    """``(asunto, cuerpo, remitente, destinatarios)`` para send_mass_mail"""
+    place_name = reservation.place.name if reservation.place_id else reservation.google_place_name
+    lines = [
+        f"Hola {reservation.contact_name},",
+        '',
+        f"{STATUS_SUBJECTS[reservation.status]}: {place_name or 'tu reserva'}, "
+        f"{reservation.reservation_date:%d/%m/%Y} a las {reservation.reservation_time:%H:%M} "
+        f"(código {reservation.confirmation_code}).",
+    ]
+    if reservation.status == 'REJECTED' and reservation.rejection_reason:
+        lines.append(f"Motivo: {reservation.rejection_reason}")
+    return STATUS_SUBJECTS[reservation.status], '\n'.join(lines), None, [reservation.contact_email]
+
+
+def _send(messages):
+    try:
+        send_mass_mail(messages)
+    except Exception:
+        logger.warning("No se pudieron enviar %d notificaciones de reservas", len(messages), exc_info=True)
+
+
+def enqueue_reservation_notifications(reservations):
+    """Enviar al confirmar un email por reserva, todos en un lote"""
+    if not getattr(settings, 'RESERVATION_EMAIL_NOTIFICATIONS', False):
+        return
+    messages = [
+        reservation_message(reservation) for reservation in reservations
+        if reservation.contact_email and reservation.status in STATUS_SUBJECTS
+    ]
+    if messages:
+        transaction.on_commit(lambda: threading.Thread(
+            target=_send, args=(messages,), name='reservation-notifications', daemon=True
+        ).start())
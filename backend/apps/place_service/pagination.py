@@ -0,0 +1,129 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class DistanceCursorPagination(BasePagination):
+    """
+    Paginación por keyset sobre querysets anotados con ``distance``.
+
+    El cursor codifica (distance, id) del último elemento de la página, así la
+    siguiente página es ``distance > d OR (distance = d AND id > id)`` con
+    LIMIT, en lugar de volver a ordenar y saltar N filas en cada página.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 20
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, page_size))
+        except (TypeError, ValueError):
+            return page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            return float(position['d']), str(position['id'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, distance, pk):
+        position = json.dumps({'d': distance, 'id': str(pk)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if 'distance' not in queryset.query.annotations:
+            raise ValidationError({'cursor': 'Cursor pagination requires latitude and longitude'})
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by('distance', 'id')
+        if position is not None:
+            distance, pk = position
+            queryset = queryset.filter(Q(distance__gt=distance) | Q(distance=distance, id__gt=pk))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_position = (results[-1].distance, results[-1].pk) if self.has_next else None
+        return results
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(*self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ReservationCursorPagination(CursorPagination):
+    """
+    Paginación por cursor (keyset sobre ``created_at``) para las bandejas de
+    reservas de negocios: cada página cuesta lo mismo sin importar cuántas
+    reservas históricas tenga el lugar.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = '-created_at'
+
+
+class PlaceReviewCursorPagination(CursorPagination):
+    """
+    Paginación por cursor de las reseñas de un lugar, de la más reciente a la
+    más antigua. El detalle del lugar embebe solo las primeras y enlaza aquí
+    con ``cursor_after`` para seguir desde la última embebida.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    # id desempata reseñas creadas en el mismo instante (igual que el prefetch)
+    ordering = ('-created_at', '-id')
+
+    def cursor_after(self, base_url, page, following):
+        """
+        Enlace a la página que empieza justo después de ``page`` (las primeras
+        reseñas, ya mostradas), donde ``following`` es la reseña siguiente.
+        Equivale al enlace ``next`` de la primera página de tamaño len(page).
+        """
+        self.base_url = base_url
+        self.page = list(page)
+        self.page_size = len(self.page)
+        self.cursor = None
+        self.has_next = True
+        self.has_previous = False
+        self.next_position = self._get_position_from_instance(following, self.ordering)
+        return self.get_next_link()
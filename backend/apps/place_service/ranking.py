@@ -0,0 +1,152 @@
+"""
+Puntuación de ranking precalculada (Place.rank_score) para "populares" y el
+orden por defecto de los listados.
+
+    rank_score = RATING_WEIGHT * calificación bayesiana + actividad
+
+- Calificación bayesiana: (C·m + suma) / (C + n), con C = PRIOR_WEIGHT
+  reseñas "virtuales" con la media global m. Un lugar con 5 reseñas de 5★
+  queda cerca de la media; uno con 500 reseñas, cerca de su promedio real.
+- Actividad: log2(Σ peso · 2^((t − EPOCH) / HALF_LIFE_DAYS)) sobre la creación
+  del lugar, reseñas, favoritos y reservas. Con un epoch fijo, un evento vale
+  el doble que otro de HALF_LIFE_DAYS días antes, que es lo mismo que decaer
+  los eventos viejos pero sin reescribir todas las filas: cada evento solo
+  actualiza su lugar y las puntuaciones siguen siendo comparables.
+
+La media global m se guarda en caché; ``refresh_rank_scores`` (comando
+refresh_rank_scores) la recalcula junto con todas las puntuaciones.
+"""
+import logging
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Favorite, Place, PlaceRatingAggregate, PlaceReview, Reservation, Review
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+HALF_LIFE_DAYS = 14
+PRIOR_WEIGHT = 10
+DEFAULT_PRIOR_MEAN = 3.5
+RATING_WEIGHT = 2.0
+
+# Peso de cada tipo de evento de actividad
+PLACE_CREATED_WEIGHT = 1
+REVIEW_WEIGHT = 3
+RESERVATION_WEIGHT = 2
+FAVORITE_WEIGHT = 1
+
+PRIOR_MEAN_CACHE_KEY = 'place-rank:prior-mean'
+PRIOR_MEAN_TIMEOUT = 60 * 60
+
+
+def event_score(weight, when):
+    """log2 del valor de un evento de peso ``weight`` ocurrido en ``when``"""
+    return math.log2(weight) + (when - EPOCH).total_seconds() / (HALF_LIFE_DAYS * 86400)
+
+
+def add_scores(a, b):
+    """log2(2^a + 2^b) sin desbordar"""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def bayesian_rating(average_rating, review_count, prior_mean):
+    return (PRIOR_WEIGHT * prior_mean + float(average_rating) * review_count) / (PRIOR_WEIGHT + review_count)
+
+
+def compute_rank_score(average_rating, review_count, activity_score, prior_mean):
+    return RATING_WEIGHT * bayesian_rating(average_rating, review_count, prior_mean) + activity_score
+
+
+def compute_prior_mean(aggregates):
+    """Media global de calificaciones a partir de un queryset de PlaceRatingAggregate"""
+    totals = aggregates.aggregate(rating_sum=Sum('rating_sum'), review_count=Sum('review_count'))
+    if not totals['review_count']:
+        return DEFAULT_PRIOR_MEAN
+    return totals['rating_sum'] / totals['review_count']
+
+
+def prior_mean():
+    try:
+        mean = cache.get(PRIOR_MEAN_CACHE_KEY)
+    except Exception:
+        logger.warning("No se pudo leer la media global de calificaciones", exc_info=True)
+        mean = None
+    if mean is None:
+        mean = compute_prior_mean(PlaceRatingAggregate.objects.all())
+        _store_prior_mean(mean)
+    return mean
+
+
+def _store_prior_mean(mean):
+    try:
+        cache.set(PRIOR_MEAN_CACHE_KEY, mean, timeout=PRIOR_MEAN_TIMEOUT)
+    except Exception:
+        logger.warning("No se pudo guardar la media global de calificaciones", exc_info=True)
+
+
+def place_rank_score(place, mean=None):
+    return compute_rank_score(
+        place.average_rating, place.total_reviews, place.activity_score,
+        prior_mean() if mean is None else mean,
+    )
+
+
+def record_activity(place_id, weight, when=None):
+    """Sumar un evento de actividad al lugar y recalcular su rank_score"""
+    score = event_score(weight, when or timezone.now())
+    with transaction.atomic():
+        place = Place.objects.select_for_update().filter(pk=place_id).first()
+        if place is None:
+            return
+        place.activity_score = add_scores(place.activity_score, score)
+        place.rank_score = place_rank_score(place)
+        # save() con update_fields: las señales de Place actualizan los rankings
+        # sin invalidar la caché de listados (ver invalidate_place_results)
+        place.save(update_fields=['activity_score', 'rank_score'])
+
+
+def activity_event_querysets(Place, PlaceReview, Review, Favorite, Reservation):
+    """``(peso, queryset de (place_id, created_at))`` por tipo de evento"""
+    return [
+        (PLACE_CREATED_WEIGHT, Place.objects.values_list('id', 'created_at')),
+        (REVIEW_WEIGHT, PlaceReview.objects.values_list('place_id', 'created_at')),
+        (REVIEW_WEIGHT, Review.objects.filter(place__isnull=False).values_list('place_id', 'created_at')),
+        (FAVORITE_WEIGHT, Favorite.objects.values_list('place_id', 'created_at')),
+        (RESERVATION_WEIGHT, Reservation.objects.filter(place__isnull=False).values_list('place_id', 'created_at')),
+    ]
+
+
+def activity_scores(event_querysets):
+    """``{place_id: activity_score}`` recorriendo todos los eventos"""
+    scores = defaultdict(lambda: None)
+    for weight, queryset in event_querysets:
+        for place_id, created_at in queryset.order_by().iterator():
+            if created_at is not None:
+                scores[place_id] = add_scores(scores[place_id], event_score(weight, created_at))
+    return scores
+
+
+@transaction.atomic
+def refresh_rank_scores(batch_size=1000):
+    """Recalcular la media global, la actividad y rank_score de todos los lugares"""
+    mean = compute_prior_mean(PlaceRatingAggregate.objects.all())
+    scores = activity_scores(activity_event_querysets(Place, PlaceReview, Review, Favorite, Reservation))
+
+    places = []
+    for place in Place.objects.only('id', 'average_rating', 'total_reviews', 'activity_score', 'rank_score').iterator():
+        place.activity_score = scores.get(place.pk) or 0.0
+        place.rank_score = place_rank_score(place, mean)
+        places.append(place)
+    Place.objects.bulk_update(places, ['activity_score', 'rank_score'], batch_size=batch_size)
+    transaction.on_commit(lambda: _store_prior_mean(mean))
+    return len(places)
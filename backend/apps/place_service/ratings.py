@@ -0,0 +1,130 @@
+"""
+Agregados de calificación por lugar.
+
+Cada reseña que cuenta para un lugar (toda PlaceReview y las Review
+aprobadas con lugar de la BD) aporta ``(place_id, rating)`` a su fila
+PlaceRatingAggregate. Las altas, cambios y bajas ajustan la fila con F()
+(sin leer las reseñas) y luego se derivan Place.average_rating y
+Place.total_reviews de ella. ``rebuild_rating_aggregates`` recalcula todo
+desde cero para corregir escrituras que no pasan por señales
+(``QuerySet.update``, cargas masivas).
+"""
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Place, PlaceRatingAggregate, PlaceReview, Review
+from .ranking import place_rank_score
+
+STARS = range(1, 6)
+
+
+def review_contribution(review):
+    """``(place_id, rating)`` con el que la reseña cuenta, o None si no cuenta"""
+    if isinstance(review, Review) and not review.is_approved:
+        return None
+    if not review.place_id or review.rating not in STARS:
+        return None
+    return review.place_id, review.rating
+
+
+def average_rating(rating_sum, review_count):
+    if not review_count:
+        return Decimal('0.00')
+    return (Decimal(rating_sum) / review_count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def aggregate_fields(star_counts):
+    """Campos de PlaceRatingAggregate a partir de ``{estrellas: conteo}``"""
+    fields = {f'star_{stars}': star_counts.get(stars, 0) for stars in STARS}
+    fields['review_count'] = sum(fields.values())
+    fields['rating_sum'] = sum(stars * star_counts.get(stars, 0) for stars in STARS)
+    return fields
+
+
+def _apply(place_id, rating, delta):
+    if delta > 0:
+        PlaceRatingAggregate.objects.get_or_create(place_id=place_id)
+    star = f'star_{rating}'
+    PlaceRatingAggregate.objects.filter(place_id=place_id).update(**{
+        'review_count': F('review_count') + delta,
+        'rating_sum': F('rating_sum') + delta * rating,
+        star: F(star) + delta,
+        'updated_at': timezone.now(),
+    })
+
+
+def refresh_place_rating(place_id):
+    """Derivar average_rating y total_reviews del agregado del lugar"""
+    # Bloqueado para no pisar un record_activity concurrente sobre rank_score
+    place = Place.objects.select_for_update().filter(pk=place_id).first()
+    if place is None:
+        return
+    aggregate = PlaceRatingAggregate.objects.filter(place_id=place_id).values(
+        'review_count', 'rating_sum'
+    ).first() or {'review_count': 0, 'rating_sum': 0}
+    place.total_reviews = aggregate['review_count']
+    place.average_rating = average_rating(aggregate['rating_sum'], aggregate['review_count'])
+    place.rank_score = place_rank_score(place)
+    # save() con update_fields para que las señales de Place (autocompletado,
+    # rankings, detalle) vean el cambio; los listados no se invalidan
+    place.save(update_fields=['average_rating', 'total_reviews', 'rank_score'])
+
+
+def apply_rating_change(old, new):
+    """
+    Ajustar los agregados cuando la contribución de una reseña pasa de
+    ``old`` a ``new`` (None = no cuenta; alta: old None; baja: new None).
+    """
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _apply(old[0], old[1], -1)
+        if new is not None:
+            _apply(new[0], new[1], 1)
+        for place_id in {contribution[0] for contribution in (old, new) if contribution is not None}:
+            refresh_place_rating(place_id)
+
+
+def star_counts_by_place():
+    """``{place_id: {estrellas: conteo}}`` de todas las reseñas que cuentan"""
+    counts = defaultdict(lambda: defaultdict(int))
+    querysets = (
+        PlaceReview.objects.all(),
+        Review.objects.filter(place__isnull=False, is_approved=True),
+    )
+    for queryset in querysets:
+        rows = queryset.filter(rating__in=STARS).order_by().values_list('place_id', 'rating').annotate(
+            count=Count('id')
+        )
+        for place_id, rating, count in rows:
+            counts[place_id][rating] += count
+    return counts
+
+
+@transaction.atomic
+def rebuild_rating_aggregates(batch_size=1000):
+    """
+    Recalcular todos los agregados y los campos derivados de Place
+    (rank_score se recalcula aparte con ranking.refresh_rank_scores)
+    """
+    counts = star_counts_by_place()
+    PlaceRatingAggregate.objects.all().delete()
+    PlaceRatingAggregate.objects.bulk_create(
+        [PlaceRatingAggregate(place_id=place_id, **aggregate_fields(stars)) for place_id, stars in counts.items()],
+        batch_size=batch_size,
+    )
+
+    places = []
+    for place in Place.objects.only('id', 'average_rating', 'total_reviews').iterator():
+        fields = aggregate_fields(counts.get(place.pk, {}))
+        total, average = fields['review_count'], average_rating(fields['rating_sum'], fields['review_count'])
+        if place.total_reviews != total or place.average_rating != average:
+            place.total_reviews, place.average_rating = total, average
+            places.append(place)
+    Place.objects.bulk_update(places, ['average_rating', 'total_reviews'], batch_size=batch_size)
+    return len(counts), len(places)
@@ -0,0 +1,38 @@
+"""
+Renderer JSON basado en orjson.
+
+Produce los mismos bytes que ``rest_framework.renderers.JSONRenderer`` con la
+configuración por defecto (UNICODE_JSON, COMPACT_JSON): fechas, Decimal y el
+resto de tipos no nativos pasan por el encoder de DRF y se escapan U+2028 y
+U+2029. Las respuestas con indentación (``; indent=4`` o la API navegable)
+y los valores que orjson no soporta (enteros de más de 64 bits) se delegan
+en el renderer de DRF.
+
+Diferencias conocidas: orjson escribe NaN/Infinity como ``null`` (DRF
+falla con STRICT_JSON) y los floats fuera de [1e-4, 1e16) sin el signo del
+exponente (``1e16`` en lugar de ``1e+16``).
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (self.get_indent(accepted_media_type, renderer_context) is not None
+                or not self.compact or self.ensure_ascii):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que DRF: JSON que también es un subconjunto válido de JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,216 @@
+"""
+Búsqueda de lugares con índice invertido (tabla PlaceSearchToken).
+
+El texto de nombre, descripción, dirección y ciudad se normaliza (minúsculas,
+sin tildes), se divide en tokens, se descartan stopwords y se aplica un
+stemmer ligero para español. Cada (token, lugar) guarda un peso acumulado por
+campo, de modo que una búsqueda es una consulta indexada por ``token`` en
+lugar de cuatro ``icontains`` sobre la tabla de lugares.
+
+Cuando la búsqueda exacta no devuelve nada se recurre a la búsqueda difusa
+sobre trigramas del nombre y la dirección (tabla PlaceTrigram), que tolera
+errores de tipeo ("pizeria" -> "Pizzería").
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+MAX_TOKEN_LENGTH = 64
+
+# Peso de cada campo en el ranking
+FIELD_WEIGHTS = {
+    'name': 8,
+    'city': 3,
+    'address': 2,
+    'description': 1,
+}
+
+SPANISH_STOPWORDS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante con contra cual de del desde
+donde durante e el ella ellas ellos en entre era es esa esas ese eso esos esta
+estas este esto estos ha hay la las le les lo los mas me mi mis muy mucho ni no
+nos o os otra otro para pero poco por que se sin sobre su sus tambien te ti tu
+tus u un una unas uno unos y ya
+""".split())
+
+
+def fold_accents(text):
+    """Minúsculas y sin tildes/diacríticos: 'Cafetería Ñuñoa' -> 'cafeteria nunoa'"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def stem(token):
+    """
+    Stemmer ligero para español: elimina plurales y la vocal final de género.
+    cafeterías -> cafeteri, restaurantes -> restaurant, lápices -> lapiz
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith('ces') and len(token) > 4:
+        token = token[:-3] + 'z'
+    elif token.endswith('es') and len(token) > 4 and token[-3] not in 'aeiou':
+        token = token[:-2]
+    elif token.endswith('s'):
+        token = token[:-1]
+    if len(token) > 3 and token[-1] in 'aoe':
+        token = token[:-1]
+    return token
+
+
+def analyze(text):
+    """Lista de términos (normalizados y con stemming) de un texto"""
+    return [
+        stem(token)[:MAX_TOKEN_LENGTH]
+        for token in TOKEN_RE.findall(fold_accents(text))
+        if token not in SPANISH_STOPWORDS
+    ]
+
+
+def place_token_weights(name, description, address, city):
+    """Peso acumulado de cada término de un lugar según los campos donde aparece"""
+    weights = Counter()
+    for field, text in (('name', name), ('description', description),
+                        ('address', address), ('city', city)):
+        for term in analyze(text):
+            weights[term] += FIELD_WEIGHTS[field]
+    return weights
+
+
+def index_place(place):
+    """Reemplazar los tokens y trigramas de búsqueda de un lugar"""
+    from .models import PlaceSearchToken, PlaceTrigram
+
+    weights = place_token_weights(place.name, place.description, place.address, place.city)
+    with transaction.atomic():
+        PlaceSearchToken.objects.filter(place_id=place.pk).delete()
+        PlaceSearchToken.objects.bulk_create([
+            PlaceSearchToken(place_id=place.pk, token=token, weight=weight)
+            for token, weight in weights.items()
+        ])
+        PlaceTrigram.objects.filter(place_id=place.pk).delete()
+        PlaceTrigram.objects.bulk_create([
+            PlaceTrigram(place_id=place.pk, **row)
+            for row in place_trigram_rows(place.name, place.address)
+        ])
+
+
+def rebuild_search_index(batch_size=500):
+    """Reconstruir el índice completo; devuelve la cantidad de lugares indexados"""
+    from .models import Place, PlaceSearchToken, PlaceTrigram
+
+    total = 0
+    with transaction.atomic():
+        PlaceSearchToken.objects.all().delete()
+        PlaceTrigram.objects.all().delete()
+        tokens = []
+        trigrams = []
+        fields = ('id', 'name', 'description', 'address', 'city')
+        for place_id, name, description, address, city in Place.objects.values_list(*fields).iterator():
+            for token, weight in place_token_weights(name, description, address, city).items():
+                tokens.append(PlaceSearchToken(place_id=place_id, token=token, weight=weight))
+            for row in place_trigram_rows(name, address):
+                trigrams.append(PlaceTrigram(place_id=place_id, **row))
+            total += 1
+            if len(tokens) >= batch_size:
+                PlaceSearchToken.objects.bulk_create(tokens)
+                tokens = []
+            if len(trigrams) >= batch_size:
+                PlaceTrigram.objects.bulk_create(trigrams)
+                trigrams = []
+        PlaceSearchToken.objects.bulk_create(tokens)
+        PlaceTrigram.objects.bulk_create(trigrams)
+    return total
+
+
+def search_places(queryset, query):
+    """
+    Filtrar ``queryset`` a los lugares que contienen todos los términos de
+    ``query`` y anotar ``search_rank`` (suma de pesos de los términos).
+    """
+    from .models import PlaceSearchToken
+
+    terms = sorted(set(analyze(query)))
+    if not terms:
+        return queryset.none()
+
+    matching = PlaceSearchToken.objects.filter(token__in=terms).values('place').annotate(
+        matched=Count('token')
+    ).filter(matched=len(terms)).values('place')
+
+    rank = PlaceSearchToken.objects.filter(
+        place=OuterRef('pk'), token__in=terms
+    ).values('place').annotate(score=Sum('weight')).values('score')
+
+    return queryset.filter(id__in=matching).annotate(
+        search_rank=Subquery(rank, output_field=IntegerField())
+    )
+
+
+# ============ BÚSQUEDA DIFUSA POR TRIGRAMAS ============
+
+# Fracción mínima de los trigramas de la consulta que debe tener un campo
+FUZZY_MIN_MATCH = 0.6
+
+
+def trigrams(text):
+    """
+    Trigramas de un texto al estilo pg_trgm: cada palabra normalizada se
+    rellena con dos espacios al inicio y uno al final.
+    'Café' -> {'  c', ' ca', 'caf', 'afe', 'fe '}
+    """
+    result = set()
+    for word in TOKEN_RE.findall(fold_accents(text)):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def place_trigram_rows(name, address):
+    """Filas de PlaceTrigram (sin el lugar) para el nombre y la dirección"""
+    from .models import PlaceTrigram
+
+    rows = []
+    for field, text in ((PlaceTrigram.NAME, name), (PlaceTrigram.ADDRESS, address)):
+        grams = trigrams(text)
+        rows.extend(
+            {'field': field, 'trigram': gram, 'field_size': len(grams)}
+            for gram in grams
+        )
+    return rows
+
+
+def fuzzy_search_places(queryset, query, min_match=FUZZY_MIN_MATCH):
+    """
+    Filtrar ``queryset`` a los lugares cuyo nombre o dirección comparten al
+    menos ``min_match`` de los trigramas de ``query`` y anotar ``search_rank``
+    con la similitud del mejor campo: compartidos / (consulta + campo - compartidos).
+    """
+    from .models import PlaceTrigram
+
+    query_grams = sorted(trigrams(query))
+    if not query_grams:
+        return queryset.none()
+
+    min_shared = max(1, math.ceil(len(query_grams) * min_match))
+    matching = PlaceTrigram.objects.filter(trigram__in=query_grams).values('place', 'field').annotate(
+        shared=Count('id')
+    ).filter(shared__gte=min_shared).values('place')
+
+    similarity = PlaceTrigram.objects.filter(
+        place=OuterRef('pk'), trigram__in=query_grams
+    ).values('field', 'field_size').annotate(
+        similarity=Cast(Count('id'), FloatField()) / (
+            Value(len(query_grams)) + F('field_size') - Count('id')
+        )
+    ).order_by('-similarity').values('similarity')[:1]
+
+    return queryset.filter(id__in=matching).annotate(
+        search_rank=Subquery(similarity, output_field=FloatField())
+    )
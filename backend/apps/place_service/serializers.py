@@ -1,10 +1,19 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from .models import (
     Place, PlaceCategory, PlaceImage, PlaceReview, Reservation, Review,
-    PlaceClaim, BusinessProfile, GooglePlaceSync, GoogleReview, Favorite
+    PlaceClaim, BusinessProfile, GooglePlaceSync, GoogleReview, Favorite, PlaceRatingAggregate
 )
 from django.contrib.auth import get_user_model
 
+from .fieldsets import SparseFieldsetMixin
+from .pagination import PlaceReviewCursorPagination
+from .fast_serializers import (
+    FastListSerializer, google_review_representation, place_list_representation,
+    review_representation
+)
+
 User = get_user_model()
 
 
@@ -22,12 +31,8 @@ class PlaceImageSerializer(serializers.ModelSerializer):
         fields = ['id', 'image', 'image_url', 'caption', 'is_primary', 'order']
 
     def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        # image es una URLField (string), no ImageField
+        return obj.image or None
 
 
 class GoogleReviewSerializer(serializers.ModelSerializer):
@@ -66,7 +71,7 @@ class PlaceReviewSerializer(serializers.ModelSerializer):
         ]
 
 
-class PlaceListSerializer(serializers.ModelSerializer):
+class PlaceListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = PlaceCategorySerializer(read_only=True)
     primary_image = serializers.SerializerMethodField()
     distance = serializers.SerializerMethodField()
@@ -79,30 +84,50 @@ class PlaceListSerializer(serializers.ModelSerializer):
             'address', 'city', 'price_range', 'average_rating', 'total_reviews',
             'primary_image', 'distance', 'features', 'isGooglePlace', 'google_place_id'
         ]
+        list_serializer_class = FastListSerializer
+
+    # Camino rápido para many=True (ver fast_serializers.py)
+    fast_representation = place_list_representation
 
     def get_primary_image(self, obj):
-        primary_image = obj.images.filter(is_primary=True).first()
-        if not primary_image:
-            primary_image = obj.images.first()
-        
-        if primary_image:
-            # Ahora image es una URLField (string), no ImageField
-            return primary_image.image
-        return None
+        # Desnormalizada en Place (ver PlaceImage.refresh_primary_image)
+        return obj.primary_image_url or None
 
     def get_distance(self, obj):
-        # This will be calculated in the view based on user location
-        return getattr(obj, 'distance', None)
+        # Annotated by the view (in km) when the request includes user location
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
 
     def get_isGooglePlace(self, obj):
         # Check if place has a google_place_id
         return bool(obj.google_place_id)
 
 
-class PlaceDetailSerializer(serializers.ModelSerializer):
+# Reseñas embebidas en el detalle del lugar; el resto se pagina en
+# /places/{id}/reviews/
+EMBEDDED_REVIEWS_LIMIT = 5
+
+
+def recent_reviews_prefetch(limit=EMBEDDED_REVIEWS_LIMIT):
+    """
+    Prefetch de las ``limit`` + 1 reseñas más recientes de cada lugar en
+    ``place.recent_reviews`` (la extra indica si hay más). Django resuelve el
+    slice con ROW_NUMBER() OVER (PARTITION BY place_id), así que no se cargan
+    todas las reseñas de los lugares populares.
+    """
+    return Prefetch(
+        'reviews',
+        queryset=PlaceReview.objects.select_related('user').order_by('-created_at', '-id')[:limit + 1],
+        to_attr='recent_reviews',
+    )
+
+
+class PlaceDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     category = PlaceCategorySerializer(read_only=True)
     images = PlaceImageSerializer(many=True, read_only=True)
-    reviews = PlaceReviewSerializer(many=True, read_only=True)
+    reviews = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
+    reviews_next = serializers.SerializerMethodField()
     owner_name = serializers.CharField(source='owner.get_full_name', read_only=True)
     isGooglePlace = serializers.SerializerMethodField()
 
@@ -113,9 +138,39 @@ class PlaceDetailSerializer(serializers.ModelSerializer):
             'address', 'city', 'state', 'country', 'zip_code', 'phone', 'email',
             'website', 'price_range', 'features', 'cuisines', 'average_rating',
             'total_reviews', 'business_hours', 'owner_name', 'is_verified',
-            'images', 'reviews', 'created_at', 'isGooglePlace', 'google_place_id'
+            'images', 'reviews', 'rating_histogram', 'reviews_next', 'created_at',
+            'isGooglePlace', 'google_place_id'
         ]
 
+    def _recent_reviews(self, obj):
+        # Cargadas por recent_reviews_prefetch(); si no, una consulta acotada
+        if not hasattr(obj, 'recent_reviews'):
+            obj.recent_reviews = list(
+                obj.reviews.select_related('user').order_by('-created_at', '-id')[:EMBEDDED_REVIEWS_LIMIT + 1]
+            )
+        return obj.recent_reviews
+
+    def get_reviews(self, obj):
+        reviews = self._recent_reviews(obj)[:EMBEDDED_REVIEWS_LIMIT]
+        return PlaceReviewSerializer(reviews, many=True, context=self.context).data
+
+    def get_rating_histogram(self, obj):
+        # Mantenido de forma incremental en PlaceRatingAggregate (ver ratings.py)
+        try:
+            return obj.rating_aggregate.histogram
+        except PlaceRatingAggregate.DoesNotExist:
+            return {str(stars): 0 for stars in range(1, 6)}
+
+    def get_reviews_next(self, obj):
+        """Cursor a /places/{id}/reviews/ a partir de la última reseña embebida"""
+        reviews = self._recent_reviews(obj)
+        if len(reviews) <= EMBEDDED_REVIEWS_LIMIT:
+            return None
+        url = reverse('place-reviews', kwargs={'pk': obj.pk}, request=self.context.get('request'))
+        return PlaceReviewCursorPagination().cursor_after(
+            url, reviews[:EMBEDDED_REVIEWS_LIMIT], reviews[EMBEDDED_REVIEWS_LIMIT]
+        )
+
     def get_isGooglePlace(self, obj):
         # Check if place has a google_place_id
         return bool(obj.google_place_id)
@@ -146,7 +201,7 @@ class PlaceReviewCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     place_name = serializers.CharField(source='place.name', read_only=True)
     place_address = serializers.CharField(source='place.address', read_only=True)
     place_image = serializers.SerializerMethodField()
@@ -169,14 +224,10 @@ class ReservationSerializer(serializers.ModelSerializer):
                           'completed_at', 'no_show_at', 'created_at', 'updated_at']
     
     def get_place_image(self, obj):
-        # Verificar si place existe antes de acceder a sus imágenes
+        # Verificar si place existe antes de acceder a su imagen
         if not obj.place:
             return None
-            
-        main_image = obj.place.images.filter(is_primary=True).first()
-        if main_image:
-            return main_image.image.url if main_image.image else None
-        return None
+        return obj.place.primary_image_url or None
 
     def get_is_upcoming(self, obj):
         from django.utils import timezone
@@ -254,7 +305,7 @@ class ReservationCreateSerializer(serializers.Serializer):
         return Reservation.objects.create(**validated_data)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
     place_name = serializers.SerializerMethodField(read_only=True)
@@ -270,6 +321,10 @@ class ReviewSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'is_approved', 'is_featured'
         ]
         read_only_fields = ['user', 'created_at', 'updated_at', 'is_approved', 'is_featured']
+        list_serializer_class = FastListSerializer
+    
+    # Camino rápido para many=True (ver fast_serializers.py)
+    fast_representation = review_representation
     
     def get_place_name(self, obj):
         return obj.place_name
@@ -302,7 +357,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         return data
 
 
-class ReviewWithPlaceSerializer(serializers.ModelSerializer):
+class ReviewWithPlaceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer para mostrar reseñas con información completa del lugar"""
     user = serializers.SerializerMethodField()
     place = serializers.SerializerMethodField()
@@ -333,18 +388,9 @@ class ReviewWithPlaceSerializer(serializers.ModelSerializer):
     
     def get_place(self, obj):
         if obj.place:
-            # Para lugares de nuestra BD
-            primary_image = None
-            if hasattr(obj.place, 'images') and obj.place.images.exists():
-                first_image = obj.place.images.filter(is_primary=True).first()
-                if not first_image:
-                    first_image = obj.place.images.first()
-                if first_image and first_image.image:
-                    request = self.context.get('request')
-                    if request:
-                        primary_image = request.build_absolute_uri(first_image.image.url)
-                    else:
-                        primary_image = first_image.image.url
+            # Para lugares de nuestra BD (imagen desnormalizada en Place,
+            # sin consultas por reseña)
+            primary_image = obj.place.primary_image_url or None
             
             return {
                 'id': str(obj.place.id),
@@ -563,12 +609,32 @@ class BusinessReservationSerializer(serializers.ModelSerializer):
 
     def get_place_image(self, obj):
         if obj.place:
-            main_image = obj.place.images.filter(is_primary=True).first()
-            if main_image:
-                return main_image.image if main_image.image else None
+            return obj.place.primary_image_url or None
         return None
 
 
+class BusinessPlaceSummarySerializer(serializers.ModelSerializer):
+    """Resumen liviano de un lugar para el dashboard de negocio (sin reseñas ni imágenes)"""
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    primary_image = serializers.SerializerMethodField()
+    isGooglePlace = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Place
+        fields = [
+            'id', 'name', 'address', 'city', 'category', 'category_name',
+            'average_rating', 'total_reviews', 'primary_image', 'is_verified',
+            'accepts_reservations', 'auto_approve_reservations',
+            'isGooglePlace', 'google_place_id'
+        ]
+
+    def get_primary_image(self, obj):
+        return obj.primary_image_url or None
+
+    def get_isGooglePlace(self, obj):
+        return bool(obj.google_place_id)
+
+
 class GoogleReviewSerializer(serializers.ModelSerializer):
     """
     Serializer para reseñas de Google Places
@@ -591,6 +657,10 @@ class GoogleReviewSerializer(serializers.ModelSerializer):
             'business_response_date',
             'scraped_at'
         ]
+        list_serializer_class = FastListSerializer
+
+    # Camino rápido para many=True (ver fast_serializers.py)
+    fast_representation = google_review_representation
 
 
 class FavoriteSerializer(serializers.ModelSerializer):
@@ -0,0 +1,274 @@
+"""
+Señales del servicio de lugares para mantener estructuras derivadas
+sincronizadas con las escrituras sobre Place.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .access import sync_business_access_on_commit
+from .attributes import sync_place_attributes
+from .autocomplete import autocomplete_index
+from .cache import (
+    CATEGORIES_CACHE, PLACE_DETAIL_CACHE, PLACES_TAG, RANKING_TAG, business_tags, invalidate_tags_on_commit,
+    object_cache,
+)
+from .events import (
+    RESERVATION_CREATED, RESERVATION_STATUS_CHANGED, publish_business_events, reservation_event, review_event
+)
+from .leaderboards import sync_place_leaderboards
+from .models import (
+    BusinessPlaceAccess, Favorite, Place, PlaceCategory, PlaceClaim, PlaceImage, PlaceReview, Reservation, Review
+)
+from .ranking import (
+    FAVORITE_WEIGHT, PLACE_CREATED_WEIGHT, RESERVATION_WEIGHT, REVIEW_WEIGHT, record_activity
+)
+from .ratings import apply_rating_change, review_contribution
+from .search import index_place
+from .spatial_index import place_index
+
+SPATIAL_FIELDS = {'latitude', 'longitude', 'category', 'price_range', 'is_active'}
+SEARCH_FIELDS = {'name', 'description', 'address', 'city'}
+ATTRIBUTE_FIELDS = {'features', 'cuisines'}
+AUTOCOMPLETE_FIELDS = {'name', 'city', 'category', 'is_active', 'average_rating', 'total_reviews'}
+LEADERBOARD_FIELDS = {'city', 'category', 'is_active', 'rank_score'}
+ACCESS_FIELDS = {'claimed_by', 'is_claimed', 'google_place_id'}
+# Escritos por ratings.py/ranking.py en cada reseña o evento de actividad
+SCORE_FIELDS = set(Place.SCORE_FIELDS)
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(fields & set(update_fields))
+
+
+@receiver(post_save, sender=Place)
+def update_spatial_index(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, SPATIAL_FIELDS):
+        transaction.on_commit(lambda: place_index.upsert(instance))
+
+
+@receiver(post_save, sender=Place)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, SEARCH_FIELDS):
+        index_place(instance)
+
+
+@receiver(post_save, sender=Place)
+def update_place_attributes(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, ATTRIBUTE_FIELDS):
+        sync_place_attributes(instance)
+
+
+@receiver(post_save, sender=Place)
+def update_autocomplete_index(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, AUTOCOMPLETE_FIELDS):
+        transaction.on_commit(lambda: autocomplete_index.update_place(instance))
+
+
+@receiver(post_save, sender=Place)
+def update_leaderboards(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, LEADERBOARD_FIELDS):
+        sync_place_leaderboards(instance)
+
+
+@receiver(post_delete, sender=Place)
+def remove_from_spatial_index(sender, instance, **kwargs):
+    place_id = instance.pk
+    transaction.on_commit(lambda: place_index.remove(place_id))
+
+
+@receiver(post_delete, sender=Place)
+def remove_from_autocomplete_index(sender, instance, **kwargs):
+    place_id = instance.pk
+    transaction.on_commit(lambda: autocomplete_index.remove_place(place_id))
+
+
+@receiver(post_save, sender=PlaceCategory)
+def update_category_autocomplete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete_index.update_category(instance))
+
+
+@receiver(post_delete, sender=PlaceCategory)
+def remove_category_autocomplete(sender, instance, **kwargs):
+    category_id = instance.pk
+    transaction.on_commit(lambda: autocomplete_index.remove_category(category_id))
+
+
+@receiver(post_save, sender=PlaceImage)
+@receiver(post_delete, sender=PlaceImage)
+def update_primary_image(sender, instance, **kwargs):
+    PlaceImage.refresh_primary_image(instance.place_id)
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+@receiver(post_save, sender=PlaceImage)
+@receiver(post_delete, sender=PlaceImage)
+@receiver(post_save, sender=PlaceCategory)
+@receiver(post_delete, sender=PlaceCategory)
+def invalidate_place_results(sender, update_fields=None, **kwargs):
+    # Las escrituras de puntajes solo invalidan los listados ordenados por
+    # puntaje (RANKING_TAG): las filas de una página cacheada se leen frescas,
+    # así que al resto no le afecta
+    if sender is Place and update_fields is not None and set(update_fields) <= SCORE_FIELDS:
+        invalidate_tags_on_commit(RANKING_TAG)
+        return
+    invalidate_tags_on_commit(PLACES_TAG)
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+def invalidate_place_detail(sender, instance, **kwargs):
+    object_cache.invalidate_on_commit(PLACE_DETAIL_CACHE, instance.pk)
+
+
+@receiver(post_save, sender=PlaceImage)
+@receiver(post_delete, sender=PlaceImage)
+@receiver(post_save, sender=PlaceReview)
+@receiver(post_delete, sender=PlaceReview)
+def invalidate_place_detail_relations(sender, instance, **kwargs):
+    # Imágenes y reseñas embebidas en el detalle
+    object_cache.invalidate_on_commit(PLACE_DETAIL_CACHE, instance.place_id)
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_business_dashboard(sender, instance, **kwargs):
+    # Snapshot cacheado del dashboard de los negocios del lugar
+    tags = business_tags(
+        [instance.place_id] if instance.place_id else [],
+        [instance.google_place_id] if instance.google_place_id else [],
+    )
+    if tags:
+        invalidate_tags_on_commit(*tags)
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+def invalidate_business_place(sender, instance, **kwargs):
+    # Resumen del lugar en el dashboard
+    invalidate_tags_on_commit(*business_tags([instance.pk]))
+
+
+@receiver(post_save, sender=PlaceCategory)
+@receiver(post_delete, sender=PlaceCategory)
+def invalidate_categories(sender, **kwargs):
+    # La categoría también va embebida en el detalle de cada lugar
+    object_cache.invalidate_on_commit(CATEGORIES_CACHE)
+    object_cache.invalidate_on_commit(PLACE_DETAIL_CACHE)
+
+
+@receiver(pre_save, sender=PlaceReview)
+@receiver(pre_save, sender=Review)
+def remember_rating_contribution(sender, instance, **kwargs):
+    # Contribución guardada en la BD antes de este save (None en altas)
+    previous = None
+    if not instance._state.adding and instance.pk is not None:
+        previous = sender.objects.filter(pk=instance.pk).first()
+    instance._previous_rating_contribution = review_contribution(previous) if previous else None
+
+
+@receiver(post_save, sender=PlaceReview)
+@receiver(post_save, sender=Review)
+def update_rating_aggregate(sender, instance, **kwargs):
+    old = getattr(instance, '_previous_rating_contribution', None)
+    apply_rating_change(old, review_contribution(instance))
+    instance._previous_rating_contribution = review_contribution(instance)
+
+
+@receiver(post_delete, sender=PlaceReview)
+@receiver(post_delete, sender=Review)
+def remove_rating_contribution(sender, instance, origin=None, **kwargs):
+    # Al borrar el lugar sus reseñas y su agregado se borran en cascada
+    if isinstance(origin, Place) or getattr(origin, 'model', None) is Place:
+        return
+    contribution = review_contribution(instance)
+    if isinstance(origin, sender) or getattr(origin, 'model', None) is sender:
+        apply_rating_change(contribution, None)
+    else:
+        # Cascada desde otro modelo (p. ej. User): el lugar puede borrarse en
+        # la misma cascada, así que se ajusta al confirmar
+        transaction.on_commit(lambda: apply_rating_change(contribution, None))
+
+
+ACTIVITY_WEIGHTS = {
+    Place: PLACE_CREATED_WEIGHT,
+    PlaceReview: REVIEW_WEIGHT,
+    Review: REVIEW_WEIGHT,
+    Favorite: FAVORITE_WEIGHT,
+    Reservation: RESERVATION_WEIGHT,
+}
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_save, sender=PlaceReview)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=Reservation)
+def record_place_activity(sender, instance, created=False, **kwargs):
+    # Solo las altas suman actividad al rank_score (ver ranking.py)
+    if not created:
+        return
+    place_id = instance.pk if sender is Place else instance.place_id
+    if place_id:
+        record_activity(place_id, ACTIVITY_WEIGHTS[sender], instance.created_at)
+
+
+def _access_user_ids(place):
+    # Usuarios cuyo alcance incluye o podría incluir el lugar
+    user_ids = set(BusinessPlaceAccess.objects.filter(place_id=place.pk).values_list('user_id', flat=True))
+    if place.is_claimed and place.claimed_by_id:
+        user_ids.add(place.claimed_by_id)
+    if place.google_place_id:
+        user_ids.update(PlaceClaim.objects.filter(
+            google_place_id=place.google_place_id, status='approved'
+        ).values_list('claimant_id', flat=True))
+    return user_ids
+
+
+@receiver(post_save, sender=PlaceClaim)
+@receiver(post_delete, sender=PlaceClaim)
+def update_business_access(sender, instance, **kwargs):
+    sync_business_access_on_commit(instance.claimant_id)
+
+
+@receiver(post_save, sender=Place)
+def update_place_access(sender, instance, created=False, update_fields=None, **kwargs):
+    if created or _touches(update_fields, ACCESS_FIELDS):
+        sync_business_access_on_commit(*_access_user_ids(instance))
+
+
+@receiver(pre_delete, sender=Place)
+def remove_place_access(sender, instance, **kwargs):
+    # Antes del borrado, mientras existen sus filas de alcance
+    sync_business_access_on_commit(*_access_user_ids(instance))
+
+
+@receiver(pre_save, sender=Reservation)
+def remember_reservation_status(sender, instance, update_fields=None, **kwargs):
+    # Estado en la BD antes de este save (None en altas)
+    previous = None
+    if not instance._state.adding and instance.pk is not None and _touches(update_fields, {'status'}):
+        previous = sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    instance._previous_status = previous
+
+
+@receiver(post_save, sender=Reservation)
+def publish_reservation_event(sender, instance, created=False, **kwargs):
+    previous = getattr(instance, '_previous_status', None)
+    if created:
+        event = reservation_event(RESERVATION_CREATED, instance)
+    elif previous is not None and previous != instance.status:
+        event = reservation_event(RESERVATION_STATUS_CHANGED, instance, previous)
+    else:
+        return
+    instance._previous_status = instance.status
+    publish_business_events([(instance.place_id, instance.google_place_id, event)])
+
+
+@receiver(post_save, sender=Review)
+def publish_review_event(sender, instance, created=False, **kwargs):
+    if created:
+        publish_business_events([(instance.place_id, instance.google_place_id, review_event(instance))])
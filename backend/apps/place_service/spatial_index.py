@@ -0,0 +1,233 @@
+"""
+Índice espacial en memoria sobre las coordenadas de Place.
+
+Cada proceso mantiene arreglos float32 con latitud/longitud más una grilla
+de celdas fijas; las consultas por radio y los k vecinos más cercanos se
+resuelven con haversine vectorizado en NumPy. El índice se construye de forma
+perezosa en la primera consulta y luego se actualiza incrementalmente desde
+las señales post_save/post_delete de Place (ver signals.py). Cada cambio se
+publica a los demás procesos (``broadcast``, Redis pub/sub) para que sus
+índices no queden desactualizados; si la suscripción se corta, el índice se
+vuelve a cargar en la siguiente consulta.
+"""
+import logging
+import math
+import threading
+import uuid
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from .cache import broadcast
+from .geo import EARTH_RADIUS_KM, bounding_box
+
+logger = logging.getLogger(__name__)
+
+PRICE_RANGE_CODES = {'$': 1, '$$': 2, '$$$': 3, '$$$$': 4}
+SPATIAL_INDEX_CHANNEL = 'spatial-index'
+
+
+class PlaceSpatialIndex:
+    """Índice por proceso de lugares activos (id, lat, lon, categoría, precio)"""
+
+    # ~5.5 km por celda; una búsqueda de 5 km revisa como mucho 3x3 celdas
+    CELL_SIZE_DEG = 0.05
+    # Por encima de este número de celdas es más barato recorrer todo el arreglo
+    MAX_SCAN_CELLS = 400
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._allocate(0)
+        broadcast.subscribe(SPATIAL_INDEX_CHANNEL, self._handle_message, on_reset=self.invalidate)
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'PLACE_SPATIAL_INDEX_ENABLED', True)
+
+    def _allocate(self, capacity):
+        self.lat = np.zeros(capacity, dtype=np.float32)
+        self.lon = np.zeros(capacity, dtype=np.float32)
+        self.category = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.ids = np.empty(capacity, dtype=object)
+        self._slots = {}
+        self._free_slots = []
+        self._cells = defaultdict(set)
+        self._size = 0
+
+    def _grow(self):
+        capacity = max(1024, len(self.lat) * 2)
+        for name in ('lat', 'lon', 'category', 'price', 'alive', 'ids'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _cell(self, lat, lon):
+        return (math.floor(lat / self.CELL_SIZE_DEG), math.floor(lon / self.CELL_SIZE_DEG))
+
+    # ------------------------------------------------------------------ carga
+
+    def ensure_loaded(self):
+        broadcast.ensure_started()
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self.rebuild()
+
+    def rebuild(self):
+        """Reconstruir el índice completo desde la base de datos"""
+        from .models import Place
+
+        rows = Place.objects.filter(is_active=True).values_list(
+            'id', 'latitude', 'longitude', 'category_id', 'price_range'
+        )
+        with self._lock:
+            self._allocate(0)
+            for place_id, lat, lon, category_id, price_range in rows.iterator():
+                self._insert(place_id, float(lat), float(lon), category_id, price_range)
+            self._loaded = True
+        logger.info("Índice espacial de lugares cargado: %s lugares", len(self._slots))
+
+    def invalidate(self):
+        """Descartar el índice; se vuelve a cargar en la siguiente consulta"""
+        with self._lock:
+            self._loaded = False
+            self._allocate(0)
+
+    # ----------------------------------------------------- actualizaciones
+
+    def _insert(self, place_id, lat, lon, category_id, price_range):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._size >= len(self.lat):
+                self._grow()
+            slot = self._size
+            self._size += 1
+
+        self.lat[slot] = lat
+        self.lon[slot] = lon
+        self.category[slot] = category_id or 0
+        self.price[slot] = PRICE_RANGE_CODES.get(price_range, 0)
+        self.alive[slot] = True
+        self.ids[slot] = place_id
+        self._slots[place_id] = slot
+        self._cells[self._cell(lat, lon)].add(slot)
+
+    def _discard(self, place_id):
+        slot = self._slots.pop(place_id, None)
+        if slot is None:
+            return
+        cell = self._cell(float(self.lat[slot]), float(self.lon[slot]))
+        self._cells[cell].discard(slot)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self.alive[slot] = False
+        self.ids[slot] = None
+        self._free_slots.append(slot)
+
+    def _upsert(self, place_id, lat, lon, category_id, price_range, is_active):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._discard(place_id)
+            if is_active:
+                self._insert(place_id, lat, lon, category_id, price_range)
+
+    def _remove(self, place_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._discard(place_id)
+
+    def upsert(self, place):
+        """Insertar o actualizar un lugar (en todos los procesos); los inactivos se retiran"""
+        row = [
+            place.pk, float(place.latitude), float(place.longitude),
+            place.category_id, place.price_range, place.is_active,
+        ]
+        self._upsert(*row)
+        if self.enabled:
+            broadcast.publish(SPATIAL_INDEX_CHANNEL, {'upsert': [str(place.pk)] + row[1:]})
+
+    def remove(self, place_id):
+        self._remove(place_id)
+        if self.enabled:
+            broadcast.publish(SPATIAL_INDEX_CHANNEL, {'remove': str(place_id)})
+
+    def _handle_message(self, data):
+        if 'upsert' in data:
+            place_id, *fields = data['upsert']
+            self._upsert(uuid.UUID(place_id), *fields)
+        elif 'remove' in data:
+            self._remove(uuid.UUID(data['remove']))
+
+    # ------------------------------------------------------------- consultas
+
+    def _candidate_slots(self, latitude, longitude, radius_km):
+        if radius_km is None:
+            return np.flatnonzero(self.alive[:self._size])
+
+        min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+        row_min, col_min = self._cell(min_lat, min_lon)
+        row_max, col_max = self._cell(max_lat, max_lon)
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > self.MAX_SCAN_CELLS:
+            return np.flatnonzero(self.alive[:self._size])
+
+        slots = []
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                cell = self._cells.get((row, col))
+                if cell:
+                    slots.extend(cell)
+        return np.fromiter(slots, dtype=np.int64, count=len(slots))
+
+    def _distances(self, slots, latitude, longitude):
+        lat = np.radians(self.lat[slots])
+        lon = np.radians(self.lon[slots])
+        origin_lat = math.radians(latitude)
+        origin_lon = math.radians(longitude)
+        a = (
+            np.sin((lat - origin_lat) / 2) ** 2
+            + math.cos(origin_lat) * np.cos(lat) * np.sin((lon - origin_lon) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _query(self, latitude, longitude, radius_km, category, price_range):
+        slots = self._candidate_slots(latitude, longitude, radius_km)
+        if category is not None:
+            slots = slots[self.category[slots] == int(category)]
+        if price_range is not None:
+            slots = slots[self.price[slots] == PRICE_RANGE_CODES.get(price_range, -1)]
+        distances = self._distances(slots, latitude, longitude)
+        if radius_km is not None:
+            inside = distances <= radius_km
+            slots, distances = slots[inside], distances[inside]
+        return slots, distances
+
+    def within_radius(self, latitude, longitude, radius_km, category=None, price_range=None):
+        """Lista de (place_id, distancia_km) dentro del radio, ordenada por distancia"""
+        self.ensure_loaded()
+        with self._lock:
+            slots, distances = self._query(latitude, longitude, radius_km, category, price_range)
+            order = np.argsort(distances, kind='stable')
+            return [(self.ids[s], float(d)) for s, d in zip(slots[order], distances[order])]
+
+    def nearest(self, latitude, longitude, k, radius_km=None, category=None, price_range=None):
+        """Los k lugares más cercanos (opcionalmente dentro de un radio)"""
+        self.ensure_loaded()
+        with self._lock:
+            slots, distances = self._query(latitude, longitude, radius_km, category, price_range)
+            if len(distances) > k:
+                top = np.argpartition(distances, k - 1)[:k]
+                slots, distances = slots[top], distances[top]
+            order = np.argsort(distances, kind='stable')
+            return [(self.ids[s], float(d)) for s, d in zip(slots[order], distances[order])]
+
+
+place_index = PlaceSpatialIndex()
@@ -0,0 +1,363 @@
+import datetime
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from apps.auth_service.models import User
+
+from .access import business_scope, scope_q
+from .models import (
+    BusinessPlaceAccess, Place, PlaceCategory, PlaceClaim, PlaceImage, PlaceRatingAggregate, PlaceReview,
+    Reservation, Review,
+)
+from .transitions import bulk_transition
+
+
+def make_user(name, role='USER'):
+    return User.objects.create_user(
+        email=f'{name}@example.com', username=name, password='x', first_name=name.title(), last_name='Test',
+        role=role,
+    )
+
+
+def make_place(owner, category, name='Lugar', **fields):
+    defaults = dict(
+        description='d', latitude=Decimal('-0.180000'), longitude=Decimal('-78.480000'),
+        address='Av. Amazonas', city='Quito', state='Pichincha', country='Ecuador', zip_code='170150',
+        price_range='$$',
+    )
+    defaults.update(fields)
+    return Place.objects.create(name=name, category=category, owner=owner, **defaults)
+
+
+def make_reservation(place, user, hour, status='PENDING', **fields):
+    return Reservation.objects.create(
+        place=place, user=user, reservation_date=datetime.date(2030, 1, 1), reservation_time=datetime.time(hour),
+        party_size=2, contact_name='Cliente', contact_phone='0999999999', contact_email='cliente@example.com',
+        status=status, **fields
+    )
+
+
+def approve_claim(claimant, place=None, google_place_id=None):
+    return PlaceClaim.objects.create(
+        place=place, google_place_id=google_place_id, claimant=claimant, business_name='Negocio',
+        contact_phone='0999999999', contact_email='negocio@example.com', status='approved',
+    )
+
+
+class ReviewFeedQueryCountTests(TestCase):
+    """El listado público de reseñas no debe hacer consultas por fila"""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = make_user('owner')
+        users = [make_user(f'user{i}') for i in range(4)]
+        categories = [PlaceCategory.objects.create(name=name, icon='i') for name in ['Restaurante', 'Cafetería']]
+        for i in range(6):
+            place = make_place(owner, categories[i % 2], name=f'Lugar {i}', latitude=Decimal('-0.180000') + i)
+            PlaceImage.objects.create(place=place, image=f'https://img.example.com/{i}.jpg', is_primary=True)
+            for user in users:
+                Review.objects.create(place=place, user=user, rating=(i % 5) + 1, title='t', content='c')
+
+    def setUp(self):
+        self.client = APIClient(HTTP_HOST='localhost')
+
+    def assert_page_queries(self, page_size):
+        with mock.patch.object(PageNumberPagination, 'page_size', page_size):
+            with self.assertNumQueries(2):  # COUNT + filas
+                response = self.client.get('/api/v1/reviews/')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), page_size)
+        self.assertTrue(all(review['place']['primary_image'] for review in results))
+
+    def test_review_list_queries_do_not_grow_with_page_size(self):
+        self.assert_page_queries(5)
+        self.assert_page_queries(20)
+
+
+class RatingAggregateTests(TestCase):
+    """PlaceRatingAggregate y los campos derivados de Place siguen a las reseñas"""
+
+    def setUp(self):
+        self.owner = make_user('owner')
+        self.users = [make_user(f'user{i}') for i in range(3)]
+        self.place = make_place(self.owner, PlaceCategory.objects.create(name='Restaurante', icon='i'))
+
+    def assert_rating(self, histogram, average, total):
+        aggregate = PlaceRatingAggregate.objects.get(place=self.place)
+        self.assertEqual(aggregate.histogram, {str(stars): histogram.get(stars, 0) for stars in range(1, 6)})
+        self.assertEqual(aggregate.review_count, total)
+        self.place.refresh_from_db()
+        self.assertEqual(self.place.average_rating, Decimal(average))
+        self.assertEqual(self.place.total_reviews, total)
+
+    def test_create_update_and_delete(self):
+        review = Review.objects.create(place=self.place, user=self.users[0], rating=5, title='t', content='c')
+        PlaceReview.objects.create(place=self.place, user=self.users[1], rating=2, title='t', comment='c')
+        self.assert_rating({5: 1, 2: 1}, '3.50', 2)
+
+        review.rating = 3
+        review.save()
+        self.assert_rating({3: 1, 2: 1}, '2.50', 2)
+
+        review.delete()
+        self.assert_rating({2: 1}, '2.00', 1)
+
+    def test_unapproved_reviews_do_not_count(self):
+        review = Review.objects.create(
+            place=self.place, user=self.users[0], rating=1, title='t', content='c', is_approved=False
+        )
+        Review.objects.create(place=self.place, user=self.users[1], rating=4, title='t', content='c')
+        self.assert_rating({4: 1}, '4.00', 1)
+
+        review.is_approved = True
+        review.save()
+        self.assert_rating({4: 1, 1: 1}, '2.50', 2)
+
+    def test_user_cascade_removes_contributions(self):
+        Review.objects.create(place=self.place, user=self.users[0], rating=5, title='t', content='c')
+        PlaceReview.objects.create(place=self.place, user=self.users[0], rating=3, title='t', comment='c')
+        Review.objects.create(place=self.place, user=self.users[1], rating=1, title='t', content='c')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[0].delete()
+        self.assert_rating({1: 1}, '1.00', 1)
+
+    def test_full_save_of_stale_place_keeps_rating(self):
+        stale = Place.objects.get(pk=self.place.pk)
+        Review.objects.create(place=self.place, user=self.users[0], rating=4, title='t', content='c')
+
+        stale.name = 'Renombrado'
+        stale.save()
+        self.assert_rating({4: 1}, '4.00', 1)
+        self.assertEqual(self.place.name, 'Renombrado')
+
+
+class BulkTransitionTests(TestCase):
+    """Transiciones en lote de reservas dentro del alcance del negocio"""
+
+    def setUp(self):
+        self.business = make_user('business', role='BUSINESS')
+        category = PlaceCategory.objects.create(name='Restaurante', icon='i')
+        self.place = make_place(self.business, category)
+        self.other_place = make_place(self.business, category, name='Otro')
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_claim(self.business, place=self.place)
+        customer = make_user('customer')
+        self.pending = make_reservation(self.place, customer, 10)
+        self.confirmed = make_reservation(self.place, customer, 11, status='CONFIRMED')
+        self.outside = make_reservation(self.other_place, customer, 10)
+
+    def transition(self, ids, action='approve'):
+        reservations = Reservation.objects.filter(scope_q(*business_scope(self.business.pk)))
+        results, updated = bulk_transition(reservations, ids, action, self.business)
+        return {result['id']: result for result in results}, updated
+
+    def test_results_per_id(self):
+        missing = uuid.uuid4()
+        results, updated = self.transition([
+            self.pending.pk, self.confirmed.pk, self.outside.pk, missing, 'not-a-uuid',
+        ])
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(results[str(self.pending.pk)], {
+            'id': str(self.pending.pk), 'result': 'updated', 'status': 'CONFIRMED',
+        })
+        self.assertEqual(results[str(self.confirmed.pk)]['result'], 'invalid_status')
+        self.assertEqual(results[str(self.confirmed.pk)]['status'], 'CONFIRMED')
+        # Fuera del alcance del negocio es indistinguible de inexistente
+        self.assertEqual(results[str(self.outside.pk)]['result'], 'not_found')
+        self.assertEqual(results[str(missing)]['result'], 'not_found')
+        self.assertEqual(results['not-a-uuid']['result'], 'invalid_id')
+
+        self.pending.refresh_from_db()
+        self.outside.refresh_from_db()
+        self.assertEqual(self.pending.status, 'CONFIRMED')
+        self.assertEqual(self.pending.approved_by, self.business)
+        self.assertEqual(self.outside.status, 'PENDING')
+
+    def test_duplicate_ids_are_normalized(self):
+        raw = str(self.pending.pk)
+        results, updated = self.transition([raw, raw.upper(), raw.replace('-', '')])
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(list(results), [raw])
+
+    def test_illegal_transition_is_not_applied(self):
+        results, updated = self.transition([self.pending.pk], action='complete')
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(results[str(self.pending.pk)]['result'], 'invalid_status')
+        self.pending.refresh_from_db()
+        self.assertEqual(self.pending.status, 'PENDING')
+
+
+class BusinessPlaceAccessTests(TestCase):
+    """El alcance materializado se regenera con los claims y el claimed_by"""
+
+    def setUp(self):
+        self.owner = make_user('owner')
+        self.business = make_user('business', role='BUSINESS')
+        self.other_business = make_user('other', role='BUSINESS')
+        category = PlaceCategory.objects.create(name='Restaurante', icon='i')
+        self.place = make_place(self.owner, category)
+        self.google_place = make_place(self.owner, category, name='De Google', google_place_id='google-1')
+
+    def scope(self, user):
+        place_ids, google_place_ids = business_scope(user.pk)
+        return set(place_ids), set(google_place_ids)
+
+    def test_claim_approval_grants_access(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            claim = PlaceClaim.objects.create(
+                place=self.place, claimant=self.business, business_name='Negocio',
+                contact_phone='0999999999', contact_email='negocio@example.com',
+            )
+        self.assertEqual(self.scope(self.business), (set(), set()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            claim.status = 'approved'
+            claim.save()
+        self.assertEqual(self.scope(self.business), ({self.place.pk}, set()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            claim.delete()
+        self.assertEqual(self.scope(self.business), (set(), set()))
+
+    def test_google_claim_resolves_place_and_keeps_google_id(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_claim(self.business, google_place_id='google-1')
+            approve_claim(self.business, google_place_id='google-unlinked')
+        self.assertEqual(self.scope(self.business), ({self.google_place.pk}, {'google-1', 'google-unlinked'}))
+        self.assertEqual(
+            set(BusinessPlaceAccess.objects.filter(user=self.business).values_list('scope_key', flat=True)),
+            {str(self.google_place.pk), 'google-1', 'google-unlinked'},
+        )
+
+    def test_claimed_by_changes_move_legacy_access(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.place.is_claimed = True
+            self.place.claimed_by = self.business
+            self.place.save()
+        self.assertEqual(self.scope(self.business), ({self.place.pk}, set()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.place.claimed_by = self.other_business
+            self.place.save()
+        self.assertEqual(self.scope(self.business), (set(), set()))
+        self.assertEqual(self.scope(self.other_business), ({self.place.pk}, set()))
+
+    def test_reservation_scope_uses_access_keys(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_claim(self.business, google_place_id='google-unlinked')
+            approve_claim(self.business, place=self.place)
+        customer = make_user('customer')
+        linked = make_reservation(self.place, customer, 10)
+        unlinked = make_reservation(None, customer, 11, google_place_id='google-unlinked')
+        make_reservation(self.google_place, customer, 12)
+
+        reservations = Reservation.objects.filter(scope_q(*business_scope(self.business.pk)))
+        self.assertEqual(set(reservations.values_list('pk', flat=True)), {linked.pk, unlinked.pk})
+
+
+class PlaceListCacheTests(TestCase):
+    """Las escrituras de puntajes solo invalidan los listados ordenados por puntaje"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(HTTP_HOST='localhost')
+        owner = make_user('owner')
+        category = PlaceCategory.objects.create(name='Restaurante', icon='i')
+        self.first = make_place(owner, category, name='A')
+        self.second = make_place(owner, category, name='B')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_scores(self.first, rank_score=1, average_rating='2.00')
+            self.set_scores(self.second, rank_score=2, average_rating='3.00')
+
+    def set_scores(self, place, **scores):
+        for field, value in scores.items():
+            setattr(place, field, value)
+        place.save(update_fields=list(scores))
+
+    def names(self, query=''):
+        response = self.client.get(f'/api/v1/places/{query}')
+        self.assertEqual(response.status_code, 200)
+        return [place['name'] for place in response.json()['results']]
+
+    def test_score_writes_refresh_ranked_orderings(self):
+        self.assertEqual(self.names(), ['B', 'A'])
+        self.assertEqual(self.names('?ordering=-average_rating'), ['B', 'A'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_scores(self.first, rank_score=3, average_rating='4.00')
+        self.assertEqual(self.names(), ['A', 'B'])
+        self.assertEqual(self.names('?ordering=-average_rating'), ['A', 'B'])
+
+    def test_score_writes_keep_other_orderings_cached(self):
+        self.assertEqual(self.names('?ordering=name'), ['A', 'B'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_scores(self.first, rank_score=3)
+        with self.assertNumQueries(1):  # solo las filas de los ids cacheados
+            self.assertEqual(self.names('?ordering=name'), ['A', 'B'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.name = 'C'
+            self.first.save()
+        self.assertEqual(self.names('?ordering=name'), ['B', 'C'])
+
+
+class BusinessWriteAuthorizationTests(TestCase):
+    """Leer reseñas usa el alcance de BusinessPlaceAccess; escribir exige claimed_by"""
+
+    def setUp(self):
+        self.business = make_user('business', role='BUSINESS')
+        self.scoped_only = make_user('scoped', role='BUSINESS')
+        category = PlaceCategory.objects.create(name='Restaurante', icon='i')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.place = make_place(self.business, category, is_claimed=True, claimed_by=self.business)
+            # Claim aprobado sin pasar por el flujo de aprobación: da alcance pero no claimed_by
+            approve_claim(self.scoped_only, place=self.place)
+        self.review = Review.objects.create(
+            place=self.place, user=make_user('customer'), rating=4, title='t', content='c'
+        )
+
+    def client_for(self, user):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(user)
+        return client
+
+    def respond(self, user):
+        return self.client_for(user).post('/api/v1/business/respond_to_review/', {
+            'review_id': str(self.review.pk), 'response': 'Gracias',
+        }, format='json')
+
+    def update_settings(self, user):
+        return self.client_for(user).post('/api/v1/business/update_place_settings/', {
+            'place_id': str(self.place.pk), 'max_capacity': 80,
+        }, format='json')
+
+    def test_scope_grants_review_reads(self):
+        for user in (self.business, self.scoped_only):
+            response = self.client_for(user).get('/api/v1/business/reviews/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([review['id'] for review in response.json()], [self.review.pk])
+
+    def test_writes_require_claimed_by(self):
+        self.assertEqual(self.respond(self.scoped_only).status_code, 404)
+        self.assertEqual(self.update_settings(self.scoped_only).status_code, 404)
+        self.review.refresh_from_db()
+        self.assertIsNone(self.review.business_response)
+
+        self.assertEqual(self.respond(self.business).status_code, 200)
+        self.assertEqual(self.update_settings(self.business).status_code, 200)
+        self.review.refresh_from_db()
+        self.place.refresh_from_db()
+        self.assertEqual(self.review.business_response, 'Gracias')
+        self.assertEqual(self.place.max_capacity, 80)
@@ -0,0 +1,115 @@
+"""
+Series temporales para analytics de negocio.
+
+Cada grupo de métricas es una sola consulta ``GROUP BY`` sobre el inicio del
+intervalo (Trunc day/week/month) con conteos condicionales; los intervalos sin
+filas se rellenan con NumPy sobre el eje completo de fechas. El número de
+consultas no depende del rango ni de la granularidad.
+"""
+import numpy as np
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import Trunc
+
+from .access import scope_q
+from .models import Reservation, Review
+
+GRANULARITIES = ('day', 'week', 'month')
+RESERVATION_METRICS = ('reservations', 'no_shows', 'cancellations')
+REVIEW_METRICS = ('reviews', 'ratings')
+METRICS = RESERVATION_METRICS + REVIEW_METRICS
+
+# Evita ejes enormes por error de parámetros (~2.7 años por día)
+MAX_BUCKETS = 1000
+
+
+def bucket_axis(start, end, granularity):
+    """Arreglo datetime64[D] con el inicio de cada intervalo entre ``start`` y ``end``"""
+    if granularity == 'month':
+        months = np.arange(
+            np.datetime64(start, 'M'), np.datetime64(end, 'M') + 1, dtype='datetime64[M]'
+        )
+        return months.astype('datetime64[D]')
+    first = np.datetime64(start, 'D')
+    if granularity == 'week':
+        # 1970-01-01 fue jueves: desplazar al lunes de la semana
+        first -= (first.astype(int) + 3) % 7
+    step = 7 if granularity == 'week' else 1
+    return np.arange(first, np.datetime64(end, 'D') + 1, step, dtype='datetime64[D]')
+
+
+def validate_range(start, end, granularity):
+    """ValueError si el rango o la granularidad no son válidos"""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if end < start:
+        raise ValueError('end must be on or after start')
+    if len(bucket_axis(start, end, granularity)) > MAX_BUCKETS:
+        raise ValueError(f'Too many buckets (max {MAX_BUCKETS}); use a coarser granularity')
+
+
+def _grouped(queryset, field, granularity, **aggregates):
+    bucket = Trunc(field, granularity, output_field=DateField())
+    return queryset.annotate(bucket=bucket).order_by().values('bucket').annotate(**aggregates)
+
+
+def _fill(axis, rows, column, dtype=np.int64):
+    """Valores de ``column`` alineados con ``axis`` (0 donde no hay filas)"""
+    values = np.zeros(len(axis), dtype=dtype)
+    if rows:
+        buckets = np.array([row['bucket'] for row in rows], dtype='datetime64[D]')
+        positions = np.searchsorted(axis, buckets)
+        valid = (positions < len(axis)) & (axis[np.minimum(positions, len(axis) - 1)] == buckets)
+        values[positions[valid]] = np.array([row[column] or 0 for row in rows], dtype=dtype)[valid]
+    return values
+
+
+def reservation_series(reservations, start, end, granularity):
+    """Reservas, no-shows y cancelaciones por fecha de la reserva (una consulta)"""
+    axis = bucket_axis(start, end, granularity)
+    rows = list(_grouped(
+        reservations.filter(reservation_date__range=(start, end)), 'reservation_date', granularity,
+        reservations=Count('id'),
+        no_shows=Count('id', filter=Q(status='NO_SHOW')),
+        cancellations=Count('id', filter=Q(status='CANCELLED')),
+    ))
+    return axis, {metric: _fill(axis, rows, metric) for metric in RESERVATION_METRICS}
+
+
+def review_series(reviews, start, end, granularity):
+    """Reseñas y calificación promedio por fecha de creación (una consulta)"""
+    axis = bucket_axis(start, end, granularity)
+    rows = list(_grouped(
+        reviews.filter(created_at__date__range=(start, end)), 'created_at', granularity,
+        reviews=Count('id'),
+        rating_sum=Sum('rating'),
+    ))
+    counts = _fill(axis, rows, 'reviews')
+    sums = _fill(axis, rows, 'rating_sum', dtype=np.float64)
+    # Promedio solo donde hay reseñas; NaN (-> None) en el resto
+    ratings = np.full(len(axis), np.nan)
+    np.divide(sums, counts, out=ratings, where=counts > 0)
+    return axis, {'reviews': counts, 'ratings': np.round(ratings, 2)}
+
+
+def build_timeseries(start, end, granularity, metrics, place_ids, google_place_ids=()):
+    """
+    ``{'buckets': [...], 'series': {métrica: [...]}}`` para los lugares dados;
+    como mucho una consulta por grupo de métricas.
+    """
+    axis = bucket_axis(start, end, granularity)
+    series = {}
+    if any(metric in RESERVATION_METRICS for metric in metrics):
+        reservations = Reservation.objects.filter(scope_q(place_ids, google_place_ids))
+        series.update(reservation_series(reservations, start, end, granularity)[1])
+    if any(metric in REVIEW_METRICS for metric in metrics):
+        series.update(review_series(Review.objects.filter(place_id__in=place_ids), start, end, granularity)[1])
+
+    return {
+        'buckets': [str(bucket) for bucket in axis],
+        'series': {
+            metric: [None if np.isnan(value) else float(value) for value in series[metric]]
+            if series[metric].dtype.kind == 'f' else series[metric].tolist()
+            for metric in metrics
+        },
+    }
+
@@ -0,0 +1,106 @@
+"""
+Transiciones de estado de reservas hechas por el negocio en lote.
+
+Las reservas se bloquean y se leen con una consulta, las elegibles pasan de
+estado con un único ``UPDATE ... WHERE status=<origen>`` y se devuelve el
+resultado de cada id. QuerySet.update() no dispara las señales de
+Reservation, así que aquí se invalidan las etiquetas del dashboard y se
+encolan las notificaciones y los eventos en tiempo real de todo el lote.
+"""
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import business_tags, invalidate_tags_on_commit
+from .events import RESERVATION_STATUS_CHANGED, publish_business_events, reservation_event
+from .notifications import enqueue_reservation_notifications
+
+MAX_BULK_RESERVATIONS = 200
+
+# acción -> (estado de origen, estado destino)
+RESERVATION_TRANSITIONS = {
+    'approve': ('PENDING', 'CONFIRMED'),
+    'reject': ('PENDING', 'REJECTED'),
+    'complete': ('CONFIRMED', 'COMPLETED'),
+    'no_show': ('CONFIRMED', 'NO_SHOW'),
+}
+
+
+def transition_fields(action, user, notes='', reason='', now=None):
+    """Campos que escribe cada acción (los mismos que los endpoints individuales)"""
+    now = now or timezone.now()
+    # update() no aplica auto_now
+    fields = {'status': RESERVATION_TRANSITIONS[action][1], 'updated_at': now}
+    if action == 'approve':
+        fields.update(business_notes=notes, approved_by=user, approved_at=now)
+    elif action == 'reject':
+        fields.update(rejection_reason=reason)
+    elif action == 'complete':
+        fields.update(business_notes=notes, completed_at=now)
+    elif action == 'no_show':
+        fields.update(business_notes=notes, no_show_at=now)
+    return fields
+
+
+def _parse_ids(reservation_ids):
+    # Se deduplica por UUID normalizado: el mismo id en mayúsculas o sin
+    # guiones no debe contar dos veces
+    ids, invalid = {}, {}
+    for raw in map(str, reservation_ids):
+        try:
+            ids.setdefault(uuid.UUID(raw), None)
+        except ValueError:
+            invalid.setdefault(raw, None)
+    return list(ids), list(invalid)
+
+
+def bulk_transition(reservations, reservation_ids, action, user, notes='', reason=''):
+    """
+    Aplicar ``action`` a ``reservation_ids`` dentro de ``reservations`` (el
+    alcance del negocio). Devuelve ``(resultados por id, actualizadas)``;
+    cada resultado es ``updated``, ``invalid_status`` (con el estado actual),
+    ``not_found`` o ``invalid_id``.
+    """
+    source, target = RESERVATION_TRANSITIONS[action]
+    ids, invalid = _parse_ids(reservation_ids)
+
+    with transaction.atomic():
+        current = {
+            reservation_id: (status, place_id, google_place_id)
+            for reservation_id, status, place_id, google_place_id in reservations.filter(
+                id__in=ids
+            ).select_for_update().values_list('id', 'status', 'place_id', 'google_place_id')
+        }
+        eligible = [
+            reservation_id for reservation_id in ids
+            if reservation_id in current and current[reservation_id][0] == source
+        ]
+        updated = 0
+        if eligible:
+            updated = reservations.model.objects.filter(id__in=eligible, status=source).update(
+                **transition_fields(action, user, notes, reason)
+            )
+            tags = business_tags(
+                {current[reservation_id][1] for reservation_id in eligible if current[reservation_id][1]},
+                {current[reservation_id][2] for reservation_id in eligible if current[reservation_id][2]},
+            )
+            invalidate_tags_on_commit(*tags)
+            changed = list(reservations.model.objects.filter(id__in=eligible).select_related('place'))
+            enqueue_reservation_notifications(changed)
+            publish_business_events([
+                (reservation.place_id, reservation.google_place_id,
+                 reservation_event(RESERVATION_STATUS_CHANGED, reservation, source))
+                for reservation in changed
+            ])
+
+    results = []
+    for reservation_id in ids:
+        if reservation_id not in current:
+            results.append({'id': str(reservation_id), 'result': 'not_found'})
+        elif current[reservation_id][0] != source:
+            results.append({'id': str(reservation_id), 'result': 'invalid_status', 'status': current[reservation_id][0]})
+        else:
+            results.append({'id': str(reservation_id), 'result': 'updated', 'status': target})
+    results += [{'id': raw, 'result': 'invalid_id'} for raw in invalid]
+    return results, updated
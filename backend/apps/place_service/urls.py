@@ -23,4 +23,7 @@ urlpatterns = [
     
     # URLs del router de negocios
     path('', include(business_router.urls)),
+    
+    # Métricas de la caché de objetos (solo staff)
+    path('cache/stats/', views.object_cache_stats, name='object-cache-stats'),
 ]
@@ -1,23 +1,35 @@
 from rest_framework import viewsets, filters, status, permissions
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from django.utils import timezone
-from geopy.distance import geodesic
-import math
 import uuid
-from django.utils import timezone
 
-from .models import Place, PlaceCategory, PlaceReview, Reservation, Review, GoogleReview, Favorite
+from .models import Place, PlaceCategory, PlaceReview, Reservation, Review, GoogleReview, Favorite, PlaceAttribute
 from .serializers import (
     PlaceListSerializer, PlaceDetailSerializer, PlaceCreateSerializer,
     PlaceCategorySerializer, PlaceReviewSerializer, PlaceReviewCreateSerializer,
     ReservationSerializer, ReservationCreateSerializer,
     ReviewSerializer, ReviewCreateSerializer, ReviewWithPlaceSerializer,
-    GoogleReviewSerializer, FavoriteSerializer
+    GoogleReviewSerializer, FavoriteSerializer, recent_reviews_prefetch
 )
 from .google_reviews_scraper import get_cached_reviews, scrape_reviews_for_place
+from .fieldsets import SparseFieldsetViewMixin
+from .filters import PlaceOrderingFilter
+from .autocomplete import autocomplete_index, suggest_from_database
+from .attributes import filter_by_attributes
+from .cache import (
+    CATEGORIES_CACHE, PLACE_DETAIL_CACHE, PLACES_TAG, RANKING_TAG, get_result, object_cache, result_key, set_result
+)
+from .clustering import cluster_places
+from .facets import facet_counts, parse_facets
+from .geo import filter_by_bbox, filter_by_radius, haversine_expression, parse_bbox
+from .leaderboards import MAX_LEADERBOARD_SIZE, board_key, top_places
+from .pagination import DistanceCursorPagination, PlaceReviewCursorPagination
+from .search import fuzzy_search_places, search_places
+from .spatial_index import place_index
 
 
 class PlaceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -25,17 +37,50 @@ class PlaceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PlaceCategorySerializer
     permission_classes = [permissions.AllowAny]
 
-
-class PlaceViewSet(viewsets.ModelViewSet):
-    queryset = Place.objects.filter(is_active=True).select_related('category', 'owner').prefetch_related('images', 'reviews')
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Two-tier object cache; category signals invalidate the whole namespace
+    def list(self, request, *args, **kwargs):
+        return Response(object_cache.get_or_set(
+            CATEGORIES_CACHE, 'list', request.build_absolute_uri(),
+            lambda: super(PlaceCategoryViewSet, self).list(request, *args, **kwargs).data,
+        ))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(object_cache.get_or_set(
+            CATEGORIES_CACHE, kwargs.get('pk'), request.build_absolute_uri(),
+            lambda: super(PlaceCategoryViewSet, self).retrieve(request, *args, **kwargs).data,
+        ))
+
+
+class PlaceViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    queryset = Place.objects.filter(is_active=True).select_related(
+        'category', 'owner', 'rating_aggregate'
+    ).prefetch_related('images', recent_reviews_prefetch())
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, PlaceOrderingFilter]
     filterset_fields = ['category', 'price_range', 'city']
     search_fields = ['name', 'description', 'address', 'city']
-    ordering_fields = ['created_at', 'average_rating', 'name']
-    ordering = ['-average_rating', '-created_at']
+    ordering_fields = ['created_at', 'average_rating', 'name', 'rank_score']
+    # Precomputed ranking (ranking.py), served by the (is_active, -rank_score, id) index
+    ordering = ['-rank_score', 'id']
+    # Relations needed by each serializer field (?fields= / ?omit=)
+    sparse_select_related = {
+        'category': ['category'], 'owner_name': ['owner'], 'rating_histogram': ['rating_aggregate'],
+    }
+    sparse_prefetch_related = {
+        'images': ['images'],
+        'reviews': [recent_reviews_prefetch()],
+        'reviews_next': [recent_reviews_prefetch()],
+    }
+    # Above this many radius matches the bounding-box query is cheaper than id__in
+    SPATIAL_INDEX_MAX_IDS = 2000
+    # List result cache (seconds); location queries are too varied to cache
+    LIST_CACHE_TIMEOUT = 300
+    UNCACHED_LIST_PARAMS = ('latitude', 'longitude', 'bbox', 'cursor')
+    # Orderings whose cached pages go stale on score writes (RANKING_TAG)
+    RANKED_ORDERING_FIELDS = {'rank_score', 'average_rating'}
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ('list', 'nearby'):
+            # nearby is a list too: cards plus the distance to the user
             return PlaceListSerializer
         elif self.action == 'create':
             return PlaceCreateSerializer
@@ -46,8 +91,53 @@ class PlaceViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
         return [permissions.AllowAny()]
 
+    def _distance_cursor_requested(self):
+        # ?cursor= on a location query, or ?page_size= on nearby (first
+        # page), switches to keyset pagination by (distance, id)
+        params = self.request.query_params
+        requested = 'cursor' in params or (self.action == 'nearby' and 'page_size' in params)
+        return requested and bool(params.get('latitude') and params.get('longitude'))
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self._distance_cursor_requested():
+            self._paginator = DistanceCursorPagination()
+        return super().paginator
+
     def get_queryset(self):
-        queryset = super().get_queryset()
+        if self.action in ('list', 'nearby'):
+            queryset = self._list_queryset()
+        else:
+            queryset = self.apply_sparse_relations(super().get_queryset())
+        
+        # Filter by features / cuisines (?features=WiFi,Parking&features_match=any)
+        for param, kind in (('features', PlaceAttribute.FEATURE), ('cuisines', PlaceAttribute.CUISINE)):
+            values = self.request.query_params.get(param)
+            if not values:
+                continue
+            match = self.request.query_params.get(f'{param}_match', 'all')
+            if match not in ('all', 'any'):
+                raise ValidationError({f'{param}_match': "Expected 'all' or 'any'"})
+            queryset = filter_by_attributes(
+                queryset, kind, values.split(','), match_all=(match == 'all')
+            )
+        
+        # Ranked full-text search over the inverted index; falls back to
+        # trigram fuzzy matching when nothing matches exactly (typos)
+        search_query = self.request.query_params.get('q')
+        if search_query:
+            results = search_places(queryset, search_query)
+            if not results.exists():
+                results = fuzzy_search_places(queryset, search_query)
+            queryset = results
+        
+        # Filter by viewport
+        bbox = self.request.query_params.get('bbox')
+        if bbox:
+            try:
+                queryset = filter_by_bbox(queryset, *parse_bbox(bbox))
+            except (ValueError, TypeError):
+                raise ValidationError({'bbox': 'Expected minLat,minLon,maxLat,maxLon'})
         
         # Filter by location radius
         latitude = self.request.query_params.get('latitude')
@@ -59,36 +149,119 @@ class PlaceViewSet(viewsets.ModelViewSet):
                 user_lat = float(latitude)
                 user_lon = float(longitude)
                 radius_km = float(radius)
-                
-                # Filter places within radius and calculate distance
-                places_with_distance = []
-                for place in queryset:
-                    place_coords = (float(place.latitude), float(place.longitude))
-                    user_coords = (user_lat, user_lon)
-                    distance = geodesic(user_coords, place_coords).kilometers
-                    
-                    if distance <= radius_km:
-                        place.distance = round(distance, 2)
-                        places_with_distance.append(place)
-                
-                # Sort by distance
-                places_with_distance.sort(key=lambda x: x.distance)
-                
-                # Convert back to queryset
-                place_ids = [place.id for place in places_with_distance]
-                queryset = queryset.filter(id__in=place_ids)
-                
-                # Preserve order and distance info
-                queryset = sorted(queryset, key=lambda x: next(p.distance for p in places_with_distance if p.id == x.id))
-                
             except (ValueError, TypeError):
-                pass
+                return queryset
+            
+            if bbox:
+                # The viewport bounds the results; coordinates only add distance
+                return queryset.annotate(distance=haversine_expression(user_lat, user_lon))
+            
+            if place_index.enabled:
+                # The in-memory index resolves the exact radius match; the
+                # database only looks up those ids by primary key
+                matches = place_index.within_radius(user_lat, user_lon, radius_km)
+                if len(matches) <= self.SPATIAL_INDEX_MAX_IDS:
+                    return queryset.filter(id__in=[place_id for place_id, _ in matches]).annotate(
+                        distance=haversine_expression(user_lat, user_lon)
+                    )
+            
+            # Bounding box + haversine distance computed in the database,
+            # ordered by distance through PlaceOrderingFilter
+            queryset = filter_by_radius(queryset, user_lat, user_lon, radius_km)
         
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        # Two-tier object cache keyed by place id (the unit of invalidation,
+        # see signals.py); the full URL distinguishes ?fields= variants
+        try:
+            place_id = str(uuid.UUID(str(kwargs.get('pk'))))
+        except ValueError:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(object_cache.get_or_set(
+            PLACE_DETAIL_CACHE, place_id, request.build_absolute_uri(),
+            lambda: super(PlaceViewSet, self).retrieve(request, *args, **kwargs).data,
+        ))
+
+    def list(self, request, *args, **kwargs):
+        # ?facets=category,price_range,city,features adds per-facet counts for
+        # the filtered places, one grouped query per facet (facets.py)
+        facets = request.query_params.get('facets')
+        if facets:
+            try:
+                facets = parse_facets(facets)
+            except ValueError as e:
+                raise ValidationError({'facets': str(e)})
+        
+        # Non-geo list queries are cached as (page ids, total count)
+        cache_key = None if facets else self._list_cache_key(request)
+        if cache_key:
+            cached = get_result(cache_key)
+            if cached is not None:
+                return self._cached_list_response(request, *cached)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            if cache_key:
+                count = self.paginator.page.paginator.count
+                set_result(cache_key, ([place.pk for place in page], count), self.LIST_CACHE_TIMEOUT)
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response({'results': serializer.data}) if facets else Response(serializer.data)
+        
+        if facets:
+            response.data['facets'] = facet_counts(queryset, facets)
+        return response
+
+    def _list_queryset(self):
+        # The list serializer reads Place.primary_image_url; images,
+        # reviews and the rating histogram are only needed by the detail serializer
+        return self.apply_sparse_relations(
+            super().get_queryset().select_related(None).select_related('category').prefetch_related(None)
+        )
+
+    def _list_cache_key(self, request):
+        params = request.query_params
+        if any(param in params for param in self.UNCACHED_LIST_PARAMS):
+            return None
+        normalized = {key: values for key, values in params.lists() if any(values)}
+        tags = [PLACES_TAG, RANKING_TAG] if self._ranked_ordering(params) else [PLACES_TAG]
+        return result_key('places:list', normalized, tags)
+
+    def _ranked_ordering(self, params):
+        # Whether the effective ordering depends on score fields: the default
+        # (-rank_score) unless q orders by relevance, or an explicit
+        # ?ordering= on rank_score / average_rating
+        valid = set(self.ordering_fields) | ({'search_rank'} if params.get('q') else set())
+        ordering = [
+            term.strip().lstrip('-') for term in params.get('ordering', '').split(',')
+        ]
+        ordering = [field for field in ordering if field in valid]
+        if not ordering:
+            return not params.get('q')
+        return bool(self.RANKED_ORDERING_FIELDS & set(ordering))
+
+    def _cached_list_response(self, request, ids, count):
+        paginator = self.paginator
+        django_paginator = paginator.django_paginator_class(range(count), paginator.get_page_size(request))
+        paginator.page = django_paginator.page(paginator.get_page_number(request, django_paginator))
+        paginator.request = request
+        
+        # Base queryset only: filters and search already ran when the ids were cached
+        places = self._list_queryset().in_bulk(ids)
+        page = [places[pk] for pk in ids if pk in places]
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def nearby(self, request):
-        """Get places near user location"""
+        """
+        Get places near user location (the 20 nearest). With ?page_size= or
+        ?cursor= the response is paginated by distance: {next, results}.
+        """
         latitude = request.query_params.get('latitude')
         longitude = request.query_params.get('longitude')
         radius = request.query_params.get('radius', 5)  # Default 5km for nearby
@@ -99,26 +272,163 @@ class PlaceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        paginated = self._distance_cursor_requested()
+        if place_index.enabled and not paginated:
+            category = request.query_params.get('category')
+            try:
+                user_lat = float(latitude)
+                user_lon = float(longitude)
+                radius_km = float(radius)
+                category = int(category) if category else None
+            except (ValueError, TypeError):
+                return Response(
+                    {'error': 'latitude, longitude, radius and category must be numbers'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # k-nearest search in the spatial index, optionally masked by
+            # category and price range
+            matches = place_index.nearest(
+                user_lat, user_lon, k=20, radius_km=radius_km, category=category,
+                price_range=request.query_params.get('price_range') or None,
+            )
+            places = self._list_queryset().in_bulk([place_id for place_id, _ in matches])
+            queryset = []
+            for place_id, distance in matches:
+                place = places.get(place_id)
+                if place is not None:
+                    place.distance = distance
+                    queryset.append(place)
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        
         # Use the same logic as get_queryset but with smaller radius
         request.query_params._mutable = True
         request.query_params['radius'] = radius
         request.query_params._mutable = False
         
-        queryset = self.get_queryset()[:20]  # Limit to 20 nearby places
+        queryset = self.get_queryset()
+        if request.query_params.get('category'):
+            queryset = queryset.filter(category=request.query_params['category'])
+        if request.query_params.get('price_range'):
+            queryset = queryset.filter(price_range=request.query_params['price_range'])
+        
+        if paginated:
+            # Keyset pagination: each page continues after the last (distance, id);
+            # the first page (no cursor yet) already carries the next link
+            page = self.paginate_queryset(queryset)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        queryset = queryset.order_by('distance')[:20]  # Limit to 20 nearby places
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Typeahead suggestions (places, categories, cities) for a prefix"""
+        prefix = request.query_params.get('prefix', '').strip()
+        if not prefix:
+            return Response(
+                {'error': 'prefix parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+        except (ValueError, TypeError):
+            limit = 8
+
+        if autocomplete_index.enabled:
+            suggestions = autocomplete_index.suggest(prefix, limit=limit)
+        else:
+            suggestions = suggest_from_database(prefix, limit=limit)
+        return Response({
+            'prefix': prefix,
+            'places': suggestions['place'],
+            'categories': suggestions['category'],
+            'cities': suggestions['city'],
+        })
+
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """Top places for a city, a category or both, from the materialized leaderboards"""
+        city = request.query_params.get('city', '').strip()
+        category = request.query_params.get('category', '').strip()
+        if not city and not category:
+            return Response(
+                {'error': 'city or category parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            category = int(category) if category else None
+        except (ValueError, TypeError):
+            return Response({'error': 'category must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), MAX_LEADERBOARD_SIZE)
+        except (ValueError, TypeError):
+            limit = 10
+
+        places = top_places(board_key(city=city, category_id=category), limit)
+        serializer = PlaceListSerializer(places, many=True, context=self.get_serializer_context())
+        return Response({
+            'city': city or None,
+            'category': category,
+            'results': serializer.data,
+        })
+
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """Get pre-aggregated place clusters for a map viewport"""
+        bbox = request.query_params.get('bbox')
+        zoom = request.query_params.get('zoom')
+        
+        if not bbox or zoom is None:
+            return Response(
+                {'error': 'bbox and zoom parameters are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            bbox = parse_bbox(bbox)
+            zoom = int(zoom)
+        except (ValueError, TypeError):
+            return Response(
+                {'error': 'bbox must be minLat,minLon,maxLat,maxLon and zoom an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Category / price_range / city filters still apply; no model instances
+        # are loaded, so drop the joins and prefetches of the list queryset
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.select_related(None).prefetch_related(None).order_by()
+        return Response(cluster_places(queryset, bbox, zoom))
+
     @action(detail=False, methods=['get'])
     def popular(self, request):
-        """Get popular places (highest rated)"""
-        queryset = self.get_queryset().filter(
-            average_rating__gte=4.0,
-            total_reviews__gte=5
-        ).order_by('-average_rating', '-total_reviews')[:20]
+        """Get popular places (Bayesian rating + recent activity, see ranking.py)"""
+        queryset = self.get_queryset().order_by('-rank_score', 'id')[:20]
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'])
+    def reviews(self, request, pk=None):
+        """Reseñas del lugar paginadas por cursor (el detalle embebe solo las primeras)"""
+        try:
+            place_id = uuid.UUID(str(pk))
+        except ValueError:
+            place_id = None
+        if place_id is None or not Place.objects.filter(pk=place_id, is_active=True).exists():
+            return Response({'error': 'Place not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Without view: the place ordering filter (?ordering=) does not apply to reviews
+        paginator = PlaceReviewCursorPagination()
+        reviews = paginator.paginate_queryset(
+            PlaceReview.objects.filter(place_id=place_id).select_related('user'), request
+        )
+        serializer = PlaceReviewSerializer(reviews, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def add_review(self, request, pk=None):
         """Add a review to a place"""
@@ -134,11 +444,9 @@ class PlaceViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
+            # average_rating / total_reviews se actualizan desde las señales (ratings.py)
             review = serializer.save(place=place)
             
-            # Update place rating
-            self._update_place_rating(place)
-            
             return Response(PlaceReviewSerializer(review).data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -172,7 +480,7 @@ class PlaceViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def favorites(self, request):
         """Get user's favorite places"""
-        favorites = Favorite.objects.filter(user=request.user).select_related('place')
+        favorites = Favorite.objects.filter(user=request.user).select_related('place', 'place__category')
         serializer = FavoriteSerializer(favorites, many=True)
         return Response(serializer.data)
     
@@ -183,15 +491,6 @@ class PlaceViewSet(viewsets.ModelViewSet):
         is_favorite = Favorite.objects.filter(user=request.user, place=place).exists()
         return Response({'is_favorite': is_favorite})
 
-    def _update_place_rating(self, place):
-        """Update place average rating and total reviews"""
-        reviews = place.reviews.all()
-        if reviews:
-            total_rating = sum(review.rating for review in reviews)
-            place.average_rating = total_rating / len(reviews)
-            place.total_reviews = len(reviews)
-            place.save(update_fields=['average_rating', 'total_reviews'])
-
 
 class PlaceReviewViewSet(viewsets.ModelViewSet):
     queryset = PlaceReview.objects.all().select_related('user', 'place')
@@ -212,16 +511,21 @@ class PlaceReviewViewSet(viewsets.ModelViewSet):
         return self.queryset
 
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['place', 'status']
     ordering = ['-reservation_date']
+    sparse_select_related = {
+        'place_name': ['place'], 'place_address': ['place'], 'place_image': ['place'],
+        'user_name': ['user'],
+    }
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user).select_related('place', 'user')
+        queryset = Reservation.objects.filter(user=self.request.user).select_related('place', 'user')
+        return self.apply_sparse_relations(queryset)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -277,13 +581,17 @@ class ReservationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewWithPlaceSerializer
     permission_classes = [permissions.AllowAny]  # Permitir acceso sin autenticación para ver reseñas
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['place', 'google_place_id', 'rating', 'is_approved']
     ordering = ['-created_at']
+    sparse_select_related = {
+        'user': ['user'], 'user_name': ['user'], 'user_email': ['user'],
+        'place': ['place', 'place__category'], 'place_name': ['place'], 'place_address': ['place'],
+    }
 
     def get_queryset(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -293,9 +601,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
             return Review.objects.filter(user=self.request.user)
         
         # Para lectura, mostrar solo reseñas aprobadas con información del lugar
-        queryset = Review.objects.filter(is_approved=True).select_related(
+        queryset = self.apply_sparse_relations(Review.objects.filter(is_approved=True).select_related(
             'user', 'place', 'place__category'
-        ).prefetch_related('place__images')
+        ))
         
         # Filtrar por place_id si se proporciona (puede ser para lugares de BD o Google Places)
         place_id = self.request.query_params.get('place_id')
@@ -348,7 +656,9 @@ class ReviewViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_reviews(self, request):
         """Obtener las reseñas del usuario actual"""
-        user_reviews = Review.objects.filter(user=request.user).select_related('place')
+        user_reviews = self.apply_sparse_relations(Review.objects.filter(user=request.user).select_related(
+            'user', 'place', 'place__category'
+        ))
         serializer = self.get_serializer(user_reviews, many=True)
         return Response(serializer.data)
 
@@ -365,10 +675,10 @@ class ReviewViewSet(viewsets.ModelViewSet):
         # Intentar filtrar por lugar de BD primero
         try:
             place_uuid = uuid.UUID(place_id)
-            place_reviews = Review.objects.filter(
+            place_reviews = self.apply_sparse_relations(Review.objects.filter(
                 place_id=place_uuid, 
                 is_approved=True
-            ).select_related('user', 'place')
+            ).select_related('user', 'place'))
         except ValueError:
             # Si no es un UUID válido, asumir que es un Google Place ID
             place_reviews = Review.objects.filter(
@@ -471,3 +781,10 @@ class GoogleReviewViewSet(viewsets.ReadOnlyModelViewSet):
                 {'error': f'Error en scraping: {str(e)}'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def object_cache_stats(request):
+    """Métricas de la caché de objetos de dos niveles (de este proceso)"""
+    return Response(object_cache.stats())
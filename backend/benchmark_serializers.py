@@ -0,0 +1,163 @@
+"""
+Benchmark de serialización para los listados de alto tráfico.
+
+Compara el camino clásico (ModelSerializer campo por campo + JSONRenderer de
+DRF) con el camino rápido (fast_serializers + ORJSONRenderer) para lugares,
+reseñas y reseñas de Google con 20, 100 y 1000 filas, y verifica que ambos
+producen exactamente los mismos bytes. No usa la base de datos: las filas se
+construyen en memoria.
+
+Uso: python benchmark_serializers.py [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import timeit
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import django
+
+# Configurar Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotlyvf_backend.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from apps.place_service.models import GoogleReview, Place, PlaceCategory, Review
+from apps.place_service.renderers import ORJSONRenderer
+from apps.place_service.serializers import (
+    GoogleReviewSerializer, PlaceListSerializer, ReviewSerializer
+)
+
+User = get_user_model()
+
+ROW_COUNTS = (20, 100, 1000)
+NAMES = ['Cafetería Quito', 'Pizza Sport', 'El Imperio', 'La Ronda', 'Parrillada Ñuñoa']
+
+
+def build_places(count):
+    categories = [
+        PlaceCategory(id=i, name=name, icon='restaurant', color='#FF5733', description='Categoría de prueba')
+        for i, name in enumerate(['Restaurante', 'Cafetería', 'Bar'], start=1)
+    ]
+    places = []
+    for i in range(count):
+        place = Place(
+            id=uuid.uuid4(),
+            name=f'{random.choice(NAMES)} {i}',
+            description='Comida típica ecuatoriana y café de especialidad',
+            category=random.choice(categories),
+            latitude=Decimal('-0.180653') + Decimal(i) / Decimal(100000),
+            longitude=Decimal('-78.467834'),
+            address='Av. Amazonas N24-03',
+            city=random.choice(['Quito', 'Guayaquil']),
+            price_range=random.choice(['$', '$$', '$$$']),
+            features=['WiFi', 'Pet Friendly'],
+            average_rating=Decimal('4.35'),
+            total_reviews=random.randint(0, 500),
+            primary_image_url=f'https://img.spotlyvf.com/{i}.jpg' if i % 3 else '',
+            google_place_id=f'ChIJ{i}' if i % 4 == 0 else None,
+        )
+        if i % 2:
+            place.distance = random.uniform(0, 10)
+        places.append(place)
+    return places
+
+
+def build_reviews(count):
+    users = [User(id=i, username=f'user{i}', email=f'user{i}@mail.com', first_name='José', last_name='Peña')
+             for i in range(1, 6)]
+    places = build_places(5)
+    now = timezone.now()
+    reviews = []
+    for i in range(count):
+        review = Review(
+            id=i + 1,
+            user=random.choice(users),
+            rating=random.randint(1, 5),
+            title='Excelente atención',
+            content='Muy buena comida, volvería "sin duda".',
+            visited_date=date(2024, 5, 1) + timedelta(days=i % 30) if i % 2 else None,
+            would_recommend=bool(i % 3),
+            created_at=now - timedelta(hours=i),
+            updated_at=now,
+        )
+        if i % 5:
+            review.place = random.choice(places)
+        else:
+            review.google_place_id = f'ChIJ{i}'
+            review.google_place_name = 'Lugar de Google'
+        reviews.append(review)
+    return reviews
+
+
+def build_google_reviews(count):
+    now = timezone.now()
+    return [
+        GoogleReview(
+            id=i + 1,
+            google_place_id='ChIJtWxC4tGj1ZERojjfo6AmbzY',
+            place_name='El Imperio',
+            reviewer_name='María Fernández',
+            reviewer_avatar_url=None if i % 2 else 'https://lh3.googleusercontent.com/a/avatar.png',
+            reviewer_review_count=i,
+            rating=random.randint(1, 5),
+            review_text='Buen lugar 👍',
+            review_date=now - timedelta(days=i),
+            is_verified=bool(i % 2),
+            helpful_count=i % 7,
+            business_response='¡Gracias!' if i % 3 == 0 else None,
+            business_response_date=now if i % 3 == 0 else None,
+            scraped_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def render_classic(serializer_class, rows):
+    data = serializers.ListSerializer(rows, child=serializer_class()).data
+    return JSONRenderer().render(data)
+
+
+def render_fast(serializer_class, rows):
+    return ORJSONRenderer().render(serializer_class(rows, many=True).data)
+
+
+def run(repeat):
+    cases = [
+        ('PlaceListSerializer', PlaceListSerializer, build_places),
+        ('ReviewSerializer', ReviewSerializer, build_reviews),
+        ('GoogleReviewSerializer', GoogleReviewSerializer, build_google_reviews),
+    ]
+    print(f"{'serializer':<24}{'filas':>7}{'clásico (ms)':>15}{'rápido (ms)':>14}{'mejora':>9}")
+    for name, serializer_class, build in cases:
+        for count in ROW_COUNTS:
+            rows = build(count)
+            classic = render_classic(serializer_class, rows)
+            fast = render_fast(serializer_class, rows)
+            if classic != fast:
+                raise SystemExit(f"❌ {name} ({count} filas): la salida no es idéntica")
+
+            number = max(1, 2000 // count)
+            classic_ms = min(timeit.repeat(
+                lambda: render_classic(serializer_class, rows), number=number, repeat=repeat
+            )) / number * 1000
+            fast_ms = min(timeit.repeat(
+                lambda: render_fast(serializer_class, rows), number=number, repeat=repeat
+            )) / number * 1000
+            print(f"{name:<24}{count:>7}{classic_ms:>15.3f}{fast_ms:>14.3f}{classic_ms / fast_ms:>8.1f}x")
+    print("✅ Salidas byte a byte idénticas en todos los casos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    random.seed(42)
+    run(args.repeat)
@@ -2,6 +2,8 @@
 ASGI config for spotlyvf_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSockets go through Channels (JWT in the query string,
+see apps/auth_service/middleware.py).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +15,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spotlyvf_backend.settings')
 
-application = get_asgi_application()
+# Inicializar Django antes de importar consumers/modelos
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from apps.auth_service.middleware import JWTAuthMiddleware  # noqa: E402
+from apps.place_service.routing import websocket_urlpatterns  # noqa: E402
+
+# Sin OriginValidator: la autenticación es por token (no cookies) y las apps
+# móviles no envían cabecera Origin
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': JWTAuthMiddleware(URLRouter(websocket_urlpatterns)),
+})
@@ -177,7 +177,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.place_service.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -234,6 +234,53 @@ EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+# Emails a los clientes cuando el negocio cambia el estado de sus reservas
+RESERVATION_EMAIL_NOTIFICATIONS = config('RESERVATION_EMAIL_NOTIFICATIONS', default=False, cast=bool)
+
+# Cache: Redis cuando REDIS_URL está configurado (docker-compose), memoria local si no
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'spotlyvf',
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'TIMEOUT': 300,
+        }
+    }
+
+# Capa de canales (WebSockets de eventos de negocio): Redis cuando REDIS_URL
+# está configurado, en memoria (un solo proceso) si no
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        }
+    }
+
+# Índice espacial en memoria para búsquedas por radio / lugares cercanos
+PLACE_SPATIAL_INDEX_ENABLED = config('PLACE_SPATIAL_INDEX_ENABLED', default=True, cast=bool)
+PLACE_AUTOCOMPLETE_ENABLED = config('PLACE_AUTOCOMPLETE_ENABLED', default=True, cast=bool)
+
+# Caché de objetos en dos niveles (LRU por proceso + CACHES['default'])
+OBJECT_CACHE_ENABLED = config('OBJECT_CACHE_ENABLED', default=True, cast=bool)
+OBJECT_CACHE_LOCAL_MAX_ENTRIES = config('OBJECT_CACHE_LOCAL_MAX_ENTRIES', default=2000, cast=int)
+OBJECT_CACHE_LOCAL_TTL = config('OBJECT_CACHE_LOCAL_TTL', default=30, cast=int)
+OBJECT_CACHE_TIMEOUT = config('OBJECT_CACHE_TIMEOUT', default=300, cast=int)
 
 # IA Configuration
 AI_MODELS_PATH = BASE_DIR.parent / 'MODELO PREDICTORIO V3'
@@ -1,5 +1,6 @@
 // src/data/businessApi.ts
-import { apiClient } from './apiClient';
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { apiClient, API_BASE_URL } from './apiClient';
 
 export interface BusinessStats {
   total_places: number;
@@ -67,6 +68,11 @@ export interface BusinessReservation {
   updated_at: string;
 }
 
+export interface BusinessReservationPage {
+  results: BusinessReservation[];
+  next: string | null;
+}
+
 export interface BusinessReview {
   id: number;
   user: {
@@ -110,8 +116,98 @@ export interface BusinessAnalytics {
   }>;
 }
 
+export type BusinessEvent =
+  | {
+      type: 'reservation.created' | 'reservation.status_changed';
+      reservation: {
+        id: string;
+        place_id: string | null;
+        google_place_id: string | null;
+        status: BusinessReservation['status'];
+        reservation_date: string;
+        reservation_time: string;
+        party_size: number;
+        contact_name: string;
+        confirmation_code: string;
+      };
+      previous_status?: BusinessReservation['status'];
+    }
+  | {
+      type: 'review.created';
+      review: {
+        id: string;
+        place_id: string | null;
+        google_place_id: string | null;
+        rating: number;
+        title: string;
+        created_at: string | null;
+      };
+    };
+
+// ws(s)://<host>/ws/business/events/ a partir de la URL de la API
+const BUSINESS_EVENTS_URL = `${API_BASE_URL.replace(/^http/, 'ws').replace(/\/api\/v\d+\/?$/, '')}/ws/business/events/`;
+const EVENTS_PING_INTERVAL = 30000;
+const EVENTS_MAX_RECONNECT_DELAY = 30000;
+
 class BusinessApiClient {
   
+  /**
+   * Suscribirse a los eventos en tiempo real del negocio (nuevas reservas,
+   * cambios de estado y nuevas reseñas). Reconecta con espera exponencial
+   * hasta que se llama a la función devuelta.
+   */
+  subscribeToEvents(onEvent: (event: BusinessEvent) => void): () => void {
+    let socket: WebSocket | null = null;
+    let pingTimer: ReturnType<typeof setInterval> | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+    let attempts = 0;
+    let closed = false;
+
+    const scheduleReconnect = () => {
+      if (closed) return;
+      const delay = Math.min(1000 * 2 ** attempts, EVENTS_MAX_RECONNECT_DELAY);
+      attempts += 1;
+      reconnectTimer = setTimeout(connect, delay);
+    };
+
+    const connect = async () => {
+      const token = await AsyncStorage.getItem('auth_token');
+      if (closed || !token) return;
+
+      socket = new WebSocket(`${BUSINESS_EVENTS_URL}?token=${encodeURIComponent(token)}`);
+      socket.onopen = () => {
+        attempts = 0;
+        pingTimer = setInterval(() => socket?.send(JSON.stringify({ type: 'ping' })), EVENTS_PING_INTERVAL);
+      };
+      socket.onmessage = (message) => {
+        try {
+          const event = JSON.parse(message.data);
+          if (event.type !== 'pong') {
+            onEvent(event as BusinessEvent);
+          }
+        } catch (error) {
+          console.error('Error parsing business event:', error);
+        }
+      };
+      socket.onclose = () => {
+        if (pingTimer) clearInterval(pingTimer);
+        pingTimer = null;
+        socket = null;
+        scheduleReconnect();
+      };
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+      if (pingTimer) clearInterval(pingTimer);
+      socket?.close();
+    };
+  }
+
+  
   /**
    * Obtener dashboard del negocio
    */
@@ -126,27 +222,41 @@ class BusinessApiClient {
   }
 
   /**
-   * Obtener reservas del negocio
+   * Obtener una página de reservas del negocio. El backend pagina por cursor
+   * (páginas de 50): ``next`` es el cursor de la página siguiente o null si
+   * no hay más; se pasa de vuelta en ``cursor`` para seguir.
    */
   async getReservations(filters?: {
     status?: string;
     date?: string;
-  }): Promise<BusinessReservation[]> {
+    date_from?: string;
+    date_to?: string;
+  }, cursor?: string | null): Promise<BusinessReservationPage> {
     try {
+      const params = new URLSearchParams();
+      if (filters?.status) params.append('status', filters.status);
+      if (filters?.date) params.append('date', filters.date);
+      if (filters?.date_from) params.append('date_from', filters.date_from);
+      if (filters?.date_to) params.append('date_to', filters.date_to);
+      if (cursor) params.append('cursor', cursor);
+
       let url = '/business/reservations/';
-      
-      if (filters) {
-        const params = new URLSearchParams();
-        if (filters.status) params.append('status', filters.status);
-        if (filters.date) params.append('date', filters.date);
-        
-        if (params.toString()) {
-          url += '?' + params.toString();
-        }
+      if (params.toString()) {
+        url += '?' + params.toString();
       }
       
-      const response = await apiClient.getDirect(url);
-      return Array.isArray(response) ? response : [];
+      const response = await apiClient.getDirect<
+        BusinessReservation[] | { next?: string | null; results?: BusinessReservation[] }
+      >(url);
+      if (Array.isArray(response)) return { results: response, next: null };
+      // El enlace next es absoluto: solo se guarda su cursor (URL.searchParams
+      // no está implementado en React Native)
+      const match = response?.next ? /[?&]cursor=([^&#]+)/.exec(response.next) : null;
+      const nextCursor = match ? decodeURIComponent(match[1]) : null;
+      return {
+        results: Array.isArray(response?.results) ? response.results : [],
+        next: nextCursor,
+      };
     } catch (error) {
       console.error('Error getting business reservations:', error);
       throw error;
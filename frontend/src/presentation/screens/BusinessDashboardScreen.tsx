@@ -71,6 +71,13 @@ export const BusinessDashboardScreen: React.FC<BusinessDashboardScreenProps> = (
     loadDashboard();
   }, []);
 
+  // Actualizar las estadísticas cuando llegan reservas o reseñas nuevas
+  useEffect(() => businessApi.subscribeToEvents(() => {
+    businessApi.getDashboard().then(setDashboard).catch((error) => {
+      console.error('Error refreshing dashboard:', error);
+    });
+  }), []);
+
   const loadDashboard = async () => {
     try {
       setIsLoading(true);
@@ -181,6 +181,8 @@ export const BusinessReservationsScreen: React.FC<BusinessReservationsScreenProp
   const { initialStatus } = route.params || {};
   
   const [reservations, setReservations] = useState<BusinessReservation[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
   const [selectedStatus, setSelectedStatus] = useState(initialStatus || 'all');
@@ -209,12 +211,25 @@ export const BusinessReservationsScreen: React.FC<BusinessReservationsScreenProp
     loadReservations();
   }, [selectedStatus]);
 
+  // Recargar la primera página cuando se crea o cambia de estado una reserva
+  useEffect(() => businessApi.subscribeToEvents((event) => {
+    if (event.type === 'review.created') return;
+    businessApi.getReservations(currentFilters()).then((page) => {
+      setReservations(page.results);
+      setNextCursor(page.next);
+    }).catch((error) => {
+      console.error('Error refreshing reservations:', error);
+    });
+  }), [selectedStatus]);
+
+  const currentFilters = () => (selectedStatus !== 'all' ? { status: selectedStatus } : undefined);
+
   const loadReservations = async () => {
     try {
       setIsLoading(true);
-      const filters = selectedStatus !== 'all' ? { status: selectedStatus } : undefined;
-      const data = await businessApi.getReservations(filters);
-      setReservations(data);
+      const page = await businessApi.getReservations(currentFilters());
+      setReservations(page.results);
+      setNextCursor(page.next);
     } catch (error) {
       console.error('Error loading reservations:', error);
       Alert.alert('Error', 'No se pudieron cargar las reservas');
@@ -223,6 +238,25 @@ export const BusinessReservationsScreen: React.FC<BusinessReservationsScreenProp
     }
   };
 
+  // Siguiente página al llegar al final de la lista
+  const loadMoreReservations = async () => {
+    if (!nextCursor || isLoadingMore || isLoading) return;
+    try {
+      setIsLoadingMore(true);
+      const page = await businessApi.getReservations(currentFilters(), nextCursor);
+      setReservations((current) => [
+        ...current,
+        ...page.results.filter((reservation) => !current.some((item) => item.id === reservation.id)),
+      ]);
+      setNextCursor(page.next);
+    } catch (error) {
+      console.error('Error loading more reservations:', error);
+      Alert.alert('Error', 'No se pudieron cargar más reservas');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const handleRefresh = async () => {
     setRefreshing(true);
     await loadReservations();
@@ -359,6 +393,21 @@ export const BusinessReservationsScreen: React.FC<BusinessReservationsScreenProp
         refreshControl={
           <RefreshControl refreshing={refreshing} onRefresh={handleRefresh} />
         }
+        onEndReached={loadMoreReservations}
+        onEndReachedThreshold={0.5}
+        ListFooterComponent={
+          nextCursor ? (
+            <View style={styles.listFooter}>
+              {isLoadingMore ? (
+                <ActivityIndicator size="small" color="#4299E1" />
+              ) : (
+                <TouchableOpacity onPress={loadMoreReservations}>
+                  <Text style={styles.loadMoreText}>Cargar más reservas</Text>
+                </TouchableOpacity>
+              )}
+            </View>
+          ) : null
+        }
         ListEmptyComponent={
           <View style={styles.emptyState}>
             <Ionicons name="calendar-outline" size={64} color="#CBD5E0" />
@@ -587,6 +636,15 @@ const styles = StyleSheet.create({
   listContent: {
     padding: 20,
   },
+  listFooter: {
+    alignItems: 'center',
+    paddingVertical: 16,
+  },
+  loadMoreText: {
+    fontSize: 14,
+    fontWeight: '600',
+    color: '#4299E1',
+  },
   reservationCard: {
     backgroundColor: '#fff',
     borderRadius: 12,